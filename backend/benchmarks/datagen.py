@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Synthetic data generator for scale testing.
+
+Bulk-loads users, events, event responses, posts, comments, likes, chat
+messages and notifications with skewed distributions: a few events are very
+popular, a few users post and chat a lot, a few posts collect most comments
+and likes. Output is deterministic for a given --seed.
+
+    cd backend
+    python -m benchmarks.datagen --users 1000000 --events 100000 --responses 5000000 \\
+        --posts 2000000 --comments 6000000 --likes 10000000 --messages 20000000 \\
+        --notifications 20000000 --truncate
+
+Rows are streamed in chunks with COPY (asyncpg copy_records_to_table) or,
+with --method insert, with multi-row INSERTs.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Sequence
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CITIES = ["Dhaka", "Chittagong", "Khulna", "Rajshahi", "Sylhet", "Barisal", "Rangpur", "Mymensingh"]
+EVENT_KINDS = ["Tree planting", "Beach clean-up", "Blood drive", "Food distribution", "Flood relief", "Tutoring"]
+NOTIFICATION_TYPES = ["chat_message", "event_created", "event_updated", "event_response_updated"]
+
+
+class IdSpace:
+    """Deterministic UUIDs derived from (table, index) so no id lists are kept in memory."""
+
+    def __init__(self, seed: int, table: str):
+        self.base = uuid.uuid5(uuid.NAMESPACE_URL, f"volunsphere-datagen/{seed}/{table}").int
+
+    def __call__(self, index: int) -> uuid.UUID:
+        return uuid.UUID(int=(self.base + index) % (1 << 128))
+
+
+def zipf_weights(n: int, s: float) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..n, suitable for random.choices(cum_weights=...)."""
+    total = 0.0
+    cumulative = []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** s
+        cumulative.append(total)
+    return cumulative
+
+
+def chunked(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.user_id = IdSpace(args.seed, "users")
+        self.event_id = IdSpace(args.seed, "events")
+        self.post_id = IdSpace(args.seed, "posts")
+        self.comment_id = IdSpace(args.seed, "comments")
+        self.row_id = IdSpace(args.seed, "rows")
+        self._row_counter = itertools.count()
+        # Popularity by rank: rank 0 is the most active user / popular event / hot post
+        self.user_weights = zipf_weights(args.users, args.skew)
+        self.post_weights = zipf_weights(args.posts, args.skew) if args.posts else []
+        self.attendees: List[List[int]] = [[] for _ in range(args.events)]
+        self.creators: List[int] = []
+
+    def next_row_id(self) -> uuid.UUID:
+        return self.row_id(next(self._row_counter))
+
+    def pick_users(self, k: int) -> List[int]:
+        return self.rng.choices(range(self.args.users), cum_weights=self.user_weights, k=k)
+
+    def pick_distinct_users(self, k: int) -> List[int]:
+        # Power users get drawn repeatedly, so top up a few times before settling
+        k = min(k, self.args.users)
+        picked = set()
+        for _ in range(5):
+            if len(picked) >= k:
+                break
+            picked.update(self.pick_users(k - len(picked)))
+        return sorted(picked)
+
+    def users(self, password_hash: str):
+        naive_now = self.now.replace(tzinfo=None)
+        for i in range(self.args.users):
+            created = naive_now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 365))
+            yield (
+                self.user_id(i), f"user_{i}", f"user{i}@gen.local", "Gen", f"User{i}",
+                self.rng.choice(CITIES), "Bangladesh", f"+880{i:010d}", True, password_hash,
+                None, f"gen-token-{i}" if self.rng.random() < 0.7 else None, created, created,
+            )
+
+    def events(self):
+        creators = self.pick_users(self.args.events)
+        self.creators = creators
+        for i in range(self.args.events):
+            start = self.now + timedelta(hours=self.rng.randint(-24 * 180, 24 * 90))
+            duration = self.rng.choice([60, 120, 180, 240, 480])
+            yield (
+                self.event_id(i), f"{self.rng.choice(EVENT_KINDS)} #{i}",
+                "Join fellow volunteers for a few hours of community work.",
+                self.rng.choice(CITIES), start, start + timedelta(minutes=duration), duration,
+                23.5 + self.rng.random(), 90.0 + self.rng.random(), "[]",
+                self.user_id(creators[i]), start - timedelta(days=7), start - timedelta(days=7),
+            )
+
+    def allocate(self, total: int, n: int) -> Iterator[int]:
+        """Split `total` over n ranks following the Zipf distribution."""
+        norm = sum(1.0 / rank ** self.args.skew for rank in range(1, n + 1))
+        for rank in range(1, n + 1):
+            expected = total * (1.0 / rank ** self.args.skew) / norm
+            yield int(expected) + (1 if self.rng.random() < expected - int(expected) else 0)
+
+    def responses(self):
+        # Popular events draw most RSVPs, power users join most events
+        for event_index, count in enumerate(self.allocate(self.args.responses, self.args.events)):
+            self.attendees[event_index] = self.pick_distinct_users(count)
+            for user_index in self.attendees[event_index]:
+                yield (
+                    self.next_row_id(), self.event_id(event_index), self.user_id(user_index),
+                    round(self.rng.uniform(0, 8), 1), self.rng.randint(0, 5),
+                )
+
+    def posts(self):
+        authors = self.pick_users(self.args.posts)
+        naive_now = self.now.replace(tzinfo=None)
+        for i in range(self.args.posts):
+            created = naive_now - timedelta(seconds=i * 30)
+            yield (self.post_id(i), self.user_id(authors[i]), f"Post {i}: what a great turnout today!", created, created)
+
+    def comments(self):
+        posts = self.rng.choices(range(self.args.posts), cum_weights=self.post_weights, k=self.args.comments)
+        authors = self.pick_users(self.args.comments)
+        naive_now = self.now.replace(tzinfo=None)
+        for i, (post_index, user_index) in enumerate(zip(posts, authors)):
+            yield (
+                self.comment_id(i), self.post_id(post_index), self.user_id(user_index),
+                f"Comment {i}", naive_now - timedelta(seconds=i),
+            )
+
+    def likes(self):
+        naive_now = self.now.replace(tzinfo=None)
+        for post_index, count in enumerate(self.allocate(self.args.likes, self.args.posts)):
+            for user_index in self.pick_distinct_users(count):
+                yield (self.next_row_id(), self.user_id(user_index), self.post_id(post_index), None, naive_now)
+
+    def messages(self):
+        rooms = [i for i, attendees in enumerate(self.attendees) if attendees]
+        if not rooms:
+            return
+        room_weights = zipf_weights(len(rooms), self.args.skew)
+        picked = self.rng.choices(rooms, cum_weights=room_weights, k=self.args.messages)
+        for i, event_index in enumerate(picked):
+            members = self.attendees[event_index]
+            # Earlier (more active) attendees send more messages
+            sender = members[min(int(self.rng.paretovariate(1.2)) - 1, len(members) - 1)]
+            yield (
+                self.next_row_id(), self.event_id(event_index), self.user_id(sender), f"user_{sender}",
+                f"user{sender}@gen.local", f"Message {i}", self.now - timedelta(seconds=self.args.messages - i),
+            )
+
+    def notifications(self):
+        users = self.pick_users(self.args.notifications)
+        for i, user_index in enumerate(users):
+            event_index = self.rng.randrange(self.args.events) if self.args.events else None
+            age = timedelta(minutes=self.rng.randint(0, 60 * 24 * 120))
+            kind = self.rng.choice(NOTIFICATION_TYPES)
+            # Unread chat notifications are unique per (user, event), so generate them read
+            is_read = kind == "chat_message" or age > timedelta(days=7) or self.rng.random() < 0.5
+            yield (
+                self.next_row_id(), self.user_id(user_index),
+                str(self.event_id(event_index)) if event_index is not None else None,
+                f"Event #{event_index}" if event_index is not None else None,
+                "You have a new update", self.now - age, is_read, kind,
+            )
+
+
+TABLES = [
+    ("users", ["uid", "username", "email", "first_name", "last_name", "city", "country", "phone",
+               "is_verified", "password_hash", "profile_image_url", "fcm_token", "created_at", "updated_at"]),
+    ("events", ["id", "title", "description", "location", "start_datetime", "end_datetime", "duration_minutes",
+                "latitude", "longitude", "image_urls", "creator_id", "created_at", "updated_at"]),
+    ("event_responses", ["id", "event_id", "user_id", "work_time_hours", "rating"]),
+    ("posts", ["id", "user_id", "content", "created_at", "updated_at"]),
+    ("comments", ["id", "post_id", "user_id", "content", "created_at"]),
+    ("likes", ["id", "user_id", "post_id", "comment_id", "created_at"]),
+    ("chat_messages", ["id", "event_id", "user_id", "username", "email", "message", "timestamp"]),
+    ("notifications", ["id", "user_id", "event_id", "event_title", "message", "timestamp", "is_read", "type"]),
+]
+
+
+async def copy_rows(conn, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, records=rows, columns=list(columns))
+
+
+async def insert_rows(conn, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+    from sqlalchemy import text
+
+    # asyncpg caps a statement at 32767 bind parameters
+    per_statement = max(1, 32767 // len(columns))
+    for start in range(0, len(rows), per_statement):
+        batch = rows[start:start + per_statement]
+        values = ", ".join(
+            "(" + ", ".join(f":p{r}_{c}" for c in range(len(columns))) + ")" for r in range(len(batch))
+        )
+        params = {f"p{r}_{c}": value for r, row in enumerate(batch) for c, value in enumerate(row)}
+        await conn.execute(text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}"), params)
+
+
+async def run(args) -> None:
+    from sqlalchemy import text
+
+    from src.auth.utils import generate_hash_password
+    from src.db.main import async_engine
+
+    generator = Generator(args)
+    sources = {
+        "users": lambda: generator.users(generate_hash_password("datagen-password")),
+        "events": generator.events,
+        "event_responses": generator.responses,
+        "posts": generator.posts,
+        "comments": generator.comments,
+        "likes": generator.likes,
+        "chat_messages": generator.messages,
+        "notifications": generator.notifications,
+    }
+    write = copy_rows if args.method == "copy" else insert_rows
+
+    async with async_engine.connect() as conn:
+        if args.truncate:
+            names = ", ".join(table for table, _ in TABLES)
+            await conn.execute(text(f"TRUNCATE {names} CASCADE"))
+            await conn.commit()
+        for table, columns in TABLES:
+            started = time.perf_counter()
+            total = 0
+            for chunk in chunked(sources[table](), args.chunk_size):
+                await write(conn, table, columns, chunk)
+                await conn.commit()
+                total += len(chunk)
+            elapsed = time.perf_counter() - started
+            print(f"✅ {table:<16} {total:>12,} rows in {elapsed:7.1f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)")
+        print("🔎 Running ANALYZE...")
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--responses", type=int, default=500_000)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--comments", type=int, default=600_000)
+    parser.add_argument("--likes", type=int, default=1_000_000)
+    parser.add_argument("--messages", type=int, default=2_000_000)
+    parser.add_argument("--notifications", type=int, default=2_000_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent, higher means more skewed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--method", choices=["copy", "insert"], default="copy")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--truncate", action="store_true", help="empty the tables first")
+    args = parser.parse_args()
+    if args.users <= 0:
+        parser.error("--users must be positive")
+    if (args.comments or args.likes) and not args.posts:
+        parser.error("--comments and --likes need --posts")
+
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault("STARTUP_MODE", "fast")
+    # Anything but "development", which would echo every statement
+    os.environ["ENVIRONMENT"] = "datagen"
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
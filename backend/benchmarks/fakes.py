@@ -0,0 +1,69 @@
+"""Local stand-ins for external services, installed through the client registry."""
+import itertools
+from types import SimpleNamespace
+
+
+class FakeFCM:
+    def __init__(self):
+        self.sent = 0
+        self._ids = itertools.count(1)
+
+    def send(self, message):
+        self.sent += 1
+        return f"projects/bench/messages/{next(self._ids)}"
+
+    def send_each_for_multicast(self, message):
+        self.sent += len(message.tokens)
+        return SimpleNamespace(success_count=len(message.tokens), failure_count=0, responses=[])
+
+
+class _FakeBucket:
+    def __init__(self, name: str):
+        self.name = name
+
+    def upload(self, path, content, file_options=None):
+        return SimpleNamespace(path=path, full_path=f"{self.name}/{path}")
+
+    def get_public_url(self, path):
+        return f"http://storage.bench.local/{self.name}/{path}"
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.storage = SimpleNamespace(from_=_FakeBucket)
+
+
+class FakeMailer:
+    def __init__(self):
+        self.outbox = []
+
+    def send_message(self, msg):
+        self.outbox.append(msg["To"])
+
+
+class _FakeCompletions:
+    def __init__(self, sql: str):
+        self.sql = sql
+
+    def create(self, **kwargs):
+        message = SimpleNamespace(content=self.sql)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeLLM:
+    def __init__(self, sql: str = "SELECT title, start_datetime FROM events ORDER BY start_datetime DESC LIMIT 10"):
+        self.chat = SimpleNamespace(completions=_FakeCompletions(sql))
+
+
+def install_fakes():
+    from src.clients import registry
+
+    fakes = {
+        "fcm": FakeFCM(),
+        "supabase": FakeSupabase(),
+        "mailer": FakeMailer(),
+        "llm": FakeLLM(),
+    }
+    for name, client in fakes.items():
+        registry.override(name, client)
+    return fakes
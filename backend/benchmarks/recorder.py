@@ -0,0 +1,78 @@
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+class Recorder:
+    """Collects latency samples per (scenario, endpoint) and summarizes them."""
+
+    def __init__(self):
+        self.samples: Dict[tuple, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.wall_time: Dict[str, float] = {}
+
+    def record(self, scenario: str, endpoint: str, seconds: float, ok: bool = True) -> None:
+        self.samples[(scenario, endpoint)].append(seconds)
+        if not ok:
+            self.errors[(scenario, endpoint)] += 1
+
+    def timer(self, scenario: str, endpoint: str):
+        return _Timer(self, scenario, endpoint)
+
+    def summary(self) -> List[dict]:
+        rows = []
+        for (scenario, endpoint), values in sorted(self.samples.items()):
+            values = sorted(values)
+            wall = self.wall_time.get(scenario) or sum(values)
+            rows.append({
+                "scenario": scenario,
+                "endpoint": endpoint,
+                "count": len(values),
+                "errors": self.errors[(scenario, endpoint)],
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "throughput_rps": len(values) / wall if wall else 0.0,
+            })
+        return rows
+
+    def print_report(self) -> None:
+        header = f"{'scenario':<14} {'endpoint':<48} {'count':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}"
+        print(header)
+        print("-" * len(header))
+        for row in self.summary():
+            print(
+                f"{row['scenario']:<14} {row['endpoint']:<48} {row['count']:>6} {row['errors']:>5} "
+                f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['throughput_rps']:>8.1f}"
+            )
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"wall_time": self.wall_time, "results": self.summary()}, f, indent=2)
+
+
+class _Timer:
+    def __init__(self, recorder: Recorder, scenario: str, endpoint: str):
+        self.recorder = recorder
+        self.scenario = scenario
+        self.endpoint = endpoint
+        self.ok = True
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record(self.scenario, self.endpoint, time.perf_counter() - self.started, ok=self.ok and exc_type is None)
+        # Failed requests are counted, the scenario keeps going
+        return exc_type is not None and issubclass(exc_type, Exception)
@@ -0,0 +1,120 @@
+"""Scripted user journeys. Each scenario is called once per iteration."""
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict
+
+import httpx
+import websockets
+
+from benchmarks.recorder import Recorder
+from benchmarks.seed import BENCH_PASSWORD, SeededData
+
+API = "/api/v1"
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    ws_url: str
+    recorder: Recorder
+    data: SeededData
+    tokens: Dict[uuid.UUID, str]
+    rng: random.Random
+    chat_messages: int = 5
+
+    def auth(self, user_id: uuid.UUID) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+    def random_user(self) -> dict:
+        return self.rng.choice(self.data.users)
+
+    async def request(self, scenario: str, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        response = None
+        with self.recorder.timer(scenario, endpoint) as timer:
+            response = await self.client.request(method, url, **kwargs)
+            timer.ok = response.status_code < 400
+        return response
+
+
+async def feed_scroll(ctx: Context, i: int) -> None:
+    user = ctx.random_user()
+    headers = ctx.auth(user["uid"])
+    await ctx.request("feed_scroll", "GET /community/posts", "GET", f"{API}/community/posts", headers=headers)
+    for post_id in ctx.rng.sample(ctx.data.post_ids, min(3, len(ctx.data.post_ids))):
+        await ctx.request(
+            "feed_scroll", "GET /community/posts/{post_id}/comments",
+            "GET", f"{API}/community/posts/{post_id}/comments",
+        )
+
+
+async def event_browse(ctx: Context, i: int) -> None:
+    await ctx.request("event_browse", "GET /events/all", "GET", f"{API}/events/all")
+    event_id = ctx.rng.choice(ctx.data.event_ids)
+    await ctx.request("event_browse", "GET /events/{event_id}", "GET", f"{API}/events/{event_id}")
+    await ctx.request("event_browse", "GET /events/{event_id}/attendees", "GET", f"{API}/events/{event_id}/attendees")
+    await ctx.request(
+        "event_browse", "GET /events/{event_id}/attendees/count",
+        "GET", f"{API}/events/{event_id}/attendees/count",
+    )
+
+
+async def leaderboard(ctx: Context, i: int) -> None:
+    sort_by = ctx.rng.choice(["overall", "rating", "hours", "events"])
+    await ctx.request("leaderboard", "GET /leaderboard/", "GET", f"{API}/leaderboard/", params={"sort_by": sort_by})
+
+
+async def login_storm(ctx: Context, i: int) -> None:
+    user = ctx.random_user()
+    await ctx.request(
+        "login_storm", "POST /auth/login", "POST", f"{API}/auth/login",
+        json={"email": user["email"], "password": BENCH_PASSWORD},
+    )
+
+
+async def chat_burst(ctx: Context, i: int) -> None:
+    # Concentrate clients on a handful of rooms so broadcasts fan out
+    rooms = ctx.data.event_ids[:max(1, min(5, len(ctx.data.event_ids)))]
+    event_id = rooms[i % len(rooms)]
+    user_id = ctx.rng.choice(ctx.data.members[event_id])
+    url = f"{ctx.ws_url}{API}/chat/ws/{event_id}?token={ctx.tokens[user_id]}"
+
+    ws = None
+    with ctx.recorder.timer("chat_burst", "WS /chat/ws/{event_id} connect"):
+        ws = await websockets.connect(url, open_timeout=10)
+    if ws is None:
+        return
+    try:
+        for n in range(ctx.chat_messages):
+            nonce = f"bench {uuid.uuid4()} #{n}"
+            with ctx.recorder.timer("chat_burst", "WS chat message round-trip") as timer:
+                await ws.send(nonce)
+                timer.ok = await _wait_for_echo(ws, nonce)
+    finally:
+        await ws.close()
+
+
+async def _wait_for_echo(ws, text: str, timeout: float = 10.0) -> bool:
+    deadline = time.perf_counter() + timeout
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        frame = await asyncio.wait_for(ws.recv(), timeout=remaining)
+        try:
+            if json.loads(frame).get("message") == text:
+                return True
+        except (ValueError, AttributeError):
+            continue
+
+
+SCENARIOS = {
+    "feed_scroll": feed_scroll,
+    "event_browse": event_browse,
+    "chat_burst": chat_burst,
+    "leaderboard": leaderboard,
+    "login_storm": login_storm,
+}
@@ -0,0 +1,165 @@
+"""Seed a benchmark dataset with multi-row inserts."""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import insert, text
+from sqlmodel import SQLModel
+
+from src.auth.models import User
+from src.auth.utils import generate_hash_password
+from src.chat.models import ChatMessage
+from src.community.models import Comment, Like, Post
+from src.db.main import async_engine, async_session_maker
+from src.events.models import Event, EventResponse
+
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 1000
+
+
+@dataclass
+class DatasetSize:
+    users: int = 500
+    events: int = 200
+    responses_per_event: int = 25
+    posts: int = 1000
+    comments_per_post: int = 3
+    likes_per_post: int = 5
+    messages_per_event: int = 20
+
+
+@dataclass
+class SeededData:
+    users: List[dict] = field(default_factory=list)
+    event_ids: List[uuid.UUID] = field(default_factory=list)
+    post_ids: List[uuid.UUID] = field(default_factory=list)
+    # event id -> ids of users allowed in its chat room (creator and attendees)
+    members: Dict[uuid.UUID, List[uuid.UUID]] = field(default_factory=dict)
+
+
+async def reset_schema() -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+async def _bulk_insert(session, model, rows: List[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await session.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def generate(size: DatasetSize, seed: int = 42):
+    """Build the dataset deterministically; returns (SeededData, [(model, rows), ...])."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    # bcrypt is deliberately slow, every benchmark user shares one hash
+    password_hash = generate_hash_password(BENCH_PASSWORD)
+    data = SeededData()
+
+    users = []
+    for i in range(size.users):
+        users.append({
+            "uid": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "username": f"bench_user_{i}",
+            "email": f"bench{i}@bench.local",
+            "first_name": "Bench",
+            "last_name": f"User{i}",
+            "city": rng.choice(["Dhaka", "Chittagong", "Khulna", "Sylhet"]),
+            "country": "Bangladesh",
+            "phone": f"+8801{i:09d}",
+            "is_verified": True,
+            "password_hash": password_hash,
+            "fcm_token": f"bench-token-{i}",
+            "created_at": now.replace(tzinfo=None),
+            "updated_at": now.replace(tzinfo=None),
+        })
+    data.users = users
+    user_ids = [u["uid"] for u in users]
+    usernames = {u["uid"]: u["username"] for u in users}
+
+    events, responses, messages = [], [], []
+    for i in range(size.events):
+        event_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        creator_id = rng.choice(user_ids)
+        start = now + timedelta(hours=rng.randint(-24 * 30, 24 * 30))
+        events.append({
+            "id": event_id,
+            "title": f"Bench event {i}",
+            "description": "Tree planting, clean-up and food distribution volunteer drive.",
+            "location": rng.choice(["Dhanmondi Lake", "Cox's Bazar beach", "Sylhet tea garden"]),
+            "start_datetime": start,
+            "end_datetime": start + timedelta(hours=3),
+            "duration_minutes": 180,
+            "latitude": 23.7 + rng.random(),
+            "longitude": 90.3 + rng.random(),
+            "image_urls": [],
+            "creator_id": creator_id,
+            "created_at": now,
+            "updated_at": now,
+        })
+        attendees = rng.sample(user_ids, min(size.responses_per_event, len(user_ids)))
+        for user_id in attendees:
+            responses.append({
+                "id": uuid.uuid4(),
+                "event_id": event_id,
+                "user_id": user_id,
+                "work_time_hours": round(rng.uniform(0, 8), 1),
+                "rating": rng.randint(0, 5),
+            })
+        data.members[event_id] = list({creator_id, *attendees})
+        for m in range(size.messages_per_event):
+            sender = rng.choice(data.members[event_id])
+            messages.append({
+                "id": uuid.uuid4(),
+                "event_id": event_id,
+                "user_id": sender,
+                "username": usernames[sender],
+                "email": None,
+                "message": f"Bench message {m}",
+                "timestamp": start - timedelta(minutes=size.messages_per_event - m),
+            })
+        data.event_ids.append(event_id)
+
+    posts, comments, likes = [], [], []
+    for i in range(size.posts):
+        post_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        created = (now - timedelta(minutes=i)).replace(tzinfo=None)
+        posts.append({
+            "id": post_id,
+            "user_id": rng.choice(user_ids),
+            "content": f"Bench post {i}: thanks everyone who showed up today!",
+            "created_at": created,
+            "updated_at": created,
+        })
+        for c in range(size.comments_per_post):
+            comments.append({
+                "id": uuid.uuid4(),
+                "post_id": post_id,
+                "user_id": rng.choice(user_ids),
+                "content": f"Bench comment {c}",
+                "created_at": created,
+            })
+        for liker in rng.sample(user_ids, min(size.likes_per_post, len(user_ids))):
+            likes.append({
+                "id": uuid.uuid4(),
+                "post_id": post_id,
+                "user_id": liker,
+                "created_at": created,
+            })
+        data.post_ids.append(post_id)
+
+    tables = [
+        (User, users), (Event, events), (EventResponse, responses), (ChatMessage, messages),
+        (Post, posts), (Comment, comments), (Like, likes),
+    ]
+    return data, tables
+
+
+async def load(tables) -> None:
+    async with async_session_maker() as session:
+        for model, rows in tables:
+            await _bulk_insert(session, model, rows)
+        await session.commit()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Check that open chat WebSockets do not hold database connections.
+
+Boots the app with a pool of --pool-size connections and no overflow, opens
+--sockets chat WebSockets and keeps them open, then checks that:
+
+  * every socket was accepted,
+  * no pooled connection is checked out while the sockets sit idle,
+  * HTTP endpoints that need the database still answer,
+  * chat messages still round-trip through the open sockets.
+
+Exits non-zero if any check fails.
+
+    cd backend
+    createdb volunsphere_bench
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.ws_pool_check --sockets 1000 --pool-size 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+import uuid
+from urllib.parse import urlparse
+
+from benchmarks.loadtest import DEFAULT_DATABASE_URL, configure_environment, free_port, serve, wait_until_ready
+
+API = "/api/v1"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--redis-url", default=os.getenv("BENCH_REDIS_URL", "fakeredis://"))
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--pool-timeout", type=int, default=5, help="seconds a checkout may wait before failing")
+    parser.add_argument("--http-requests", type=int, default=200, help="DB-backed requests sent while the sockets are open")
+    parser.add_argument("--messages", type=int, default=50, help="chat messages sent through the open sockets")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--allow-any-database", action="store_true")
+    return parser.parse_args()
+
+
+def raise_fd_limit(needed: int) -> None:
+    # Both ends of every socket live on this machine
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        if target < needed:
+            print(f"⚠️ Open file limit is {target}, {needed} may be needed; raise it with ulimit -n")
+
+
+async def pool_checked_out(client) -> float:
+    metrics = (await client.get("/metrics")).text
+    for line in metrics.splitlines():
+        if line.startswith("db_pool_checked_out "):
+            return float(line.split()[1])
+    raise RuntimeError("db_pool_checked_out missing from /metrics")
+
+
+async def main_async(args) -> bool:
+    import httpx
+    import websockets
+
+    from benchmarks.scenarios import _wait_for_echo
+    from benchmarks.seed import DatasetSize, generate, load, reset_schema
+    from src.auth.utils import create_access_token
+
+    size = DatasetSize(users=500, events=20, responses_per_event=50, posts=10, messages_per_event=5)
+    data, tables = generate(size, seed=args.seed)
+    if not args.skip_seed:
+        print(f"🌱 Seeding {size}...")
+        await reset_schema()
+        await load(tables)
+    tokens = {u["uid"]: create_access_token({"uid": u["uid"], "email": u["email"]}) for u in data.users}
+    rng = random.Random(args.seed)
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    sockets = []
+    failures = []
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            await wait_until_ready(client)
+
+            # Open every socket and keep it
+            connect_slots = asyncio.Semaphore(100)
+
+            async def open_socket(i):
+                event_id = data.event_ids[i % len(data.event_ids)]
+                user_id = rng.choice(data.members[event_id])
+                async with connect_slots:
+                    ws = await websockets.connect(
+                        f"ws://127.0.0.1:{port}{API}/chat/ws/{event_id}?token={tokens[user_id]}",
+                        open_timeout=args.pool_timeout * 4,
+                        max_queue=None,
+                    )
+                sockets.append(ws)
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(open_socket(i) for i in range(args.sockets)), return_exceptions=True)
+            errors = [r for r in results if isinstance(r, Exception)]
+            print(f"🔌 {len(sockets)}/{args.sockets} sockets open in {time.perf_counter() - started:.1f}s")
+            if errors:
+                failures.append(f"{len(errors)} sockets failed to open, first error: {errors[0]!r}")
+
+            # Give history replays a moment to finish, then nothing should hold the pool
+            await asyncio.sleep(1)
+            checked_out = await pool_checked_out(client)
+            print(f"🏊 Pooled connections checked out with {len(sockets)} idle sockets: {checked_out:.0f}")
+            if checked_out > 0:
+                failures.append(f"{checked_out:.0f} pooled connections held by idle sockets")
+
+            # The pool must still serve HTTP traffic
+            started = time.perf_counter()
+            responses = await asyncio.gather(
+                *(client.get(f"{API}/events/{rng.choice(data.event_ids)}") for _ in range(args.http_requests)),
+                return_exceptions=True,
+            )
+            ok = sum(1 for r in responses if not isinstance(r, Exception) and r.status_code == 200)
+            print(f"🌐 {ok}/{args.http_requests} HTTP requests answered in {time.perf_counter() - started:.1f}s")
+            if ok < args.http_requests:
+                failures.append(f"{args.http_requests - ok} HTTP requests failed while sockets were open")
+
+            # And chat itself keeps working
+            senders = rng.sample(sockets, min(args.messages, len(sockets)))
+
+            async def round_trip(ws):
+                nonce = f"pool check {uuid.uuid4()}"
+                await ws.send(nonce)
+                return await _wait_for_echo(ws, nonce, timeout=args.pool_timeout * 4)
+
+            echoes = await asyncio.gather(*(round_trip(ws) for ws in senders), return_exceptions=True)
+            delivered = sum(1 for e in echoes if e is True)
+            print(f"💬 {delivered}/{len(senders)} chat messages echoed")
+            if delivered < len(senders):
+                failures.append(f"{len(senders) - delivered} chat messages were not echoed")
+    finally:
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+        server.terminate()
+        server.join(10)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Open WebSockets hold no pooled connections")
+    return not failures
+
+
+def main():
+    args = parse_args()
+    database = urlparse(args.database_url).path.lstrip("/")
+    if "bench" not in database and not args.allow_any_database and not args.skip_seed:
+        raise SystemExit(f"Refusing to drop tables in '{database}', use a *bench* database or --allow-any-database")
+    configure_environment(args)
+    # A pool that cannot grow, with a short wait, turns any held connection into a failure
+    os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+    os.environ["DB_POOL_TIMEOUT"] = str(args.pool_timeout)
+    os.environ["METRICS_ENABLED"] = "true"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    raise_fd_limit(args.sockets * 2 + 256)
+    sys.exit(0 if asyncio.run(main_async(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Pillow drawing for volunteer certificates.
+
+This runs in the render pool's spawned processes, so it imports nothing from
+src: unpickling a task here must not build the app, its engine or its Redis
+client. Everything it needs, asset paths included, comes in as arguments.
+"""
+import io
+import os
+from typing import Optional
+
+# Bump when the layout changes so cached renders are not reused
+RENDER_VERSION = 1
+
+PAGE_SIZE = (1240, 1754)  # A4 at 150 dpi
+PAGE_DPI = 150
+MAX_LISTED_EVENTS = 5
+
+INDIGO = (26, 35, 126)
+ORANGE = (216, 67, 21)
+AMBER = (255, 160, 0)
+TEAL = (0, 105, 92)
+GREY = (97, 97, 97)
+BLACK = (33, 33, 33)
+
+
+def _font(size: int, path: Optional[str] = None):
+    from PIL import ImageFont
+
+    if path and os.path.exists(path):
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def _centered(draw, y: int, text: str, font, fill) -> int:
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    draw.text(((PAGE_SIZE[0] - (right - left)) / 2, y), text, font=font, fill=fill)
+    return y + (bottom - top)
+
+
+def render_certificate(payload: dict, fmt: str, script_font_path: Optional[str] = None,
+                       signature_path: Optional[str] = None) -> bytes:
+    """Draw the certificate as PNG or PDF bytes; missing assets fall back to a plain rendering."""
+    from PIL import Image, ImageDraw
+
+    width, height = PAGE_SIZE
+    image = Image.new("RGB", PAGE_SIZE, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, width - 40, height - 40), outline=AMBER, width=6)
+
+    y = _centered(draw, 120, "Volunsphere Community", _font(44), INDIGO) + 20
+    y = _centered(draw, y, '"Empowering Change through Action"', _font(26), GREY) + 70
+    y = _centered(draw, y, "Certificate of Volunteer Appreciation", _font(50), ORANGE) + 30
+    draw.line((140, y, width - 140, y), fill=AMBER, width=4)
+
+    y = _centered(draw, y + 70, "This certificate is proudly presented to", _font(28), BLACK) + 40
+    y = _centered(draw, y, payload["name"], _font(96, script_font_path), TEAL) + 60
+    y = _centered(draw, y, "In recognition of outstanding contribution through:", _font(28), BLACK) + 60
+
+    stats = [
+        ("Total Events", str(payload["events_joined"])),
+        ("Hours Volunteered", f"{payload['hours_volunteered']:.1f} hrs"),
+        ("Average Rating", f"{payload['average_rating']} / 5"),
+    ]
+    stat_font = _font(30)
+    for label, value in stats:
+        draw.text((260, y), label, font=stat_font, fill=BLACK)
+        right = draw.textbbox((0, 0), value, font=stat_font)[2]
+        draw.text((width - 260 - right, y), value, font=stat_font, fill=INDIGO)
+        y += 56
+
+    titles = payload["event_titles"]
+    y = _centered(draw, y + 40, "Events Participated:", _font(32), INDIGO) + 30
+    item_font = _font(26)
+    for title in titles[:MAX_LISTED_EVENTS]:
+        y = _centered(draw, y, f"- {title}", item_font, BLACK) + 20
+    if len(titles) > MAX_LISTED_EVENTS:
+        _centered(draw, y, f"+{len(titles) - MAX_LISTED_EVENTS} more...", _font(22), GREY)
+
+    sig_x, sig_y = width - 460, height - 360
+    if signature_path and os.path.exists(signature_path):
+        with Image.open(signature_path) as signature:
+            signature = signature.convert("RGBA")
+            signature.thumbnail((300, 150))
+            image.paste(signature, (sig_x + (300 - signature.width) // 2, sig_y), signature)
+    draw.text((sig_x + 40, sig_y + 160), "Director of Programs", font=_font(22), fill=BLACK)
+    draw.text((sig_x + 40, sig_y + 192), "Volunsphere Community", font=_font(22), fill=BLACK)
+
+    buffer = io.BytesIO()
+    if fmt == "pdf":
+        image.save(buffer, "PDF", resolution=PAGE_DPI)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
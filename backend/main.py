@@ -1,39 +1,96 @@
 #!/usr/bin/env python3
+import glob
+import importlib.util
 import os
-import sys
+import shutil
 import subprocess
+import sys
+import tempfile
+
+import uvicorn
 
 # Add the current directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-print(f"🚀 Starting from: {current_dir}")
-print(f"📁 Directory contents: {os.listdir(current_dir)}")
-
-# Check if src directory exists
-src_path = os.path.join(current_dir, 'src')
-if os.path.exists(src_path):
-    print(f"✅ Found src directory: {os.listdir(src_path)}")
-else:
-    print("❌ src directory not found!")
-    sys.exit(1)
-
-# Run migrations first
-print("🔄 Running migrations...")
-try:
-    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], 
-                  cwd=current_dir, check=True)
-    print("✅ Migrations completed")
-except subprocess.CalledProcessError as e:
-    print(f"⚠️ Migrations failed: {e}")
-
-# Start the server
-print("🌟 Starting FastAPI server...")
-os.chdir(current_dir)
 
-import uvicorn
-from src import app
+def resolve_workers() -> int:
+    if Config.WEB_CONCURRENCY > 0:
+        return Config.WEB_CONCURRENCY
+    return os.cpu_count() or 1
+
+
+def resolve_impl(setting: str, fast: str, fallback: str) -> str:
+    if setting != "auto":
+        return setting
+    return fast if importlib.util.find_spec(fast) else fallback
+
 
+# Everything below only runs in the launcher. Spawned processes (uvicorn workers,
+# the certificate render pool) re-import this file and must not load the app here.
 if __name__ == "__main__":
-    port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    print(f"🚀 Starting from: {current_dir}")
+    print(f"📁 Directory contents: {os.listdir(current_dir)}")
+
+    # Check if src directory exists
+    src_path = os.path.join(current_dir, 'src')
+    if os.path.exists(src_path):
+        print(f"✅ Found src directory: {os.listdir(src_path)}")
+    else:
+        print("❌ src directory not found!")
+        sys.exit(1)
+
+    from src.config import Config
+
+    # Run migrations first, unless they are handled by a separate release step
+    if Config.STARTUP_MODE == "full":
+        print("🔄 Running migrations...")
+        try:
+            subprocess.run([sys.executable, "-m", "src.db.migrate"],
+                          cwd=current_dir, check=True)
+            # The schema is current, so workers must not race on create_all as well
+            os.environ["STARTUP_MODE"] = "fast"
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️ Migrations failed: {e}")
+    else:
+        print("⏭️ Skipping migrations (STARTUP_MODE=fast)")
+
+    # Start the server
+    os.chdir(current_dir)
+
+    workers = resolve_workers()
+    loop = resolve_impl(Config.SERVER_LOOP, "uvloop", "asyncio")
+    http = resolve_impl(Config.SERVER_HTTP, "httptools", "h11")
+    print(f"🌟 Starting FastAPI server: {workers} worker(s), loop={loop}, http={http}")
+
+    # Workers share Prometheus metrics through files, /metrics aggregates them
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    created_metrics_dir = None
+    if metrics_dir:
+        # Files left by a previous run would be summed into this one
+        for name in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(name)
+    elif workers > 1:
+        created_metrics_dir = tempfile.mkdtemp(prefix="volunsphere-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = created_metrics_dir
+
+    # With several workers uvicorn supervises the processes: SIGHUP restarts them one
+    # by one and SIGTERM drains them. On shutdown open WebSockets are closed with 1012
+    # (service restart) so clients reconnect, and handlers get GRACEFUL_SHUTDOWN_TIMEOUT
+    # seconds to finish what they are doing.
+    try:
+        uvicorn.run(
+            "src:app",
+            host=Config.HOST,
+            port=Config.PORT,
+            workers=workers,
+            loop=loop,
+            http=http,
+            proxy_headers=True,
+            forwarded_allow_ips=Config.FORWARDED_ALLOW_IPS,
+            timeout_keep_alive=Config.KEEPALIVE_TIMEOUT,
+            timeout_graceful_shutdown=Config.GRACEFUL_SHUTDOWN_TIMEOUT,
+        )
+    finally:
+        if created_metrics_dir:
+            shutil.rmtree(created_metrics_dir, ignore_errors=True)
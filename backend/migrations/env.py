@@ -21,6 +21,8 @@ try:
     from src.auth.models import User
     from src.events.models import Event, EventResponse  
     from src.chat.models import ChatMessage
+    from src.community.models import Post, Comment, Like
+    from src.notifications.models import Notification
     print("✅ All models imported successfully")
 except ImportError as e:
     print(f"⚠️ Warning: Some models could not be imported: {e}")
@@ -0,0 +1,36 @@
+"""Add user directory search indexes
+
+Revision ID: 0a9e6c3b5d27
+Revises: f1b7d4e8a6c2
+Create Date: 2026-10-19 16:21:55.904118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a9e6c3b5d27'
+down_revision: Union[str, None] = 'f1b7d4e8a6c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_users_username_lower_pattern ON users (lower(username) text_pattern_ops)")
+    # Must match src.auth.models.user_search_document
+    op.execute(
+        "CREATE INDEX ix_users_search_trgm ON users USING gin "
+        "(lower(username || ' ' || first_name || ' ' || last_name || ' ' || city) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_search_trgm', table_name='users')
+    op.drop_index('ix_users_username_lower_pattern', table_name='users')
@@ -0,0 +1,34 @@
+"""Add notifications inbox index
+
+Revision ID: c41f7e2a9b13
+Revises: ba75862ae7ff
+Create Date: 2026-10-19 10:12:41.507733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7e2a9b13'
+down_revision: Union[str, None] = 'ba75862ae7ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_notifications_user_id_is_read_timestamp',
+        'notifications',
+        ['user_id', 'is_read', 'timestamp'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_id_is_read_timestamp', table_name='notifications')
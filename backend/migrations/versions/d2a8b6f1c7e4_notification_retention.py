@@ -0,0 +1,67 @@
+"""Notification retention: count column, age index, unread chat rollup
+
+Revision ID: d2a8b6f1c7e4
+Revises: c41f7e2a9b13
+Create Date: 2026-10-19 13:40:18.220914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8b6f1c7e4'
+down_revision: Union[str, None] = 'c41f7e2a9b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('count', sa.Integer(), server_default='1', nullable=False))
+    op.create_index('ix_notifications_timestamp', 'notifications', ['timestamp'], unique=False)
+
+    # Fold existing unread chat_message rows into the newest one per (user, event)
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   row_number() OVER w AS rn,
+                   count(*) OVER (PARTITION BY user_id, event_id) AS total
+            FROM notifications
+            WHERE type = 'chat_message' AND NOT is_read
+            WINDOW w AS (PARTITION BY user_id, event_id ORDER BY timestamp DESC, id DESC)
+        )
+        UPDATE notifications n
+        SET count = ranked.total,
+            message = ranked.total || ' new messages' || coalesce(' in ' || n.event_title, '')
+        FROM ranked
+        WHERE n.id = ranked.id AND ranked.rn = 1 AND ranked.total > 1
+    """)
+    op.execute("""
+        DELETE FROM notifications n
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, event_id ORDER BY timestamp DESC, id DESC
+            ) AS rn
+            FROM notifications
+            WHERE type = 'chat_message' AND NOT is_read
+        ) ranked
+        WHERE n.id = ranked.id AND ranked.rn > 1
+    """)
+    op.create_index(
+        'uq_notifications_unread_chat_message',
+        'notifications',
+        ['user_id', 'event_id'],
+        unique=True,
+        postgresql_where=sa.text("type = 'chat_message' AND NOT is_read"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_notifications_unread_chat_message', table_name='notifications')
+    op.drop_index('ix_notifications_timestamp', table_name='notifications')
+    op.drop_column('notifications', 'count')
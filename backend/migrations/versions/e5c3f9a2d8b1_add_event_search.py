@@ -0,0 +1,48 @@
+"""Add event full-text search
+
+Revision ID: e5c3f9a2d8b1
+Revises: d2a8b6f1c7e4
+Create Date: 2026-10-19 15:02:37.618204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c3f9a2d8b1'
+down_revision: Union[str, None] = 'd2a8b6f1c7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'events',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_events_start_datetime', 'events', ['start_datetime'], unique=False)
+    op.create_index('ix_events_latitude_longitude', 'events', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_latitude_longitude', table_name='events')
+    op.drop_index('ix_events_start_datetime', table_name='events')
+    op.drop_index('ix_events_search_vector', table_name='events')
+    op.drop_column('events', 'search_vector')
@@ -0,0 +1,47 @@
+"""Add community post and comment search
+
+Revision ID: f1b7d4e8a6c2
+Revises: e5c3f9a2d8b1
+Create Date: 2026-10-19 15:48:09.331457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d4e8a6c2'
+down_revision: Union[str, None] = 'e5c3f9a2d8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in ('posts', 'comments'):
+        op.add_column(
+            table,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed("to_tsvector('english', content)", persisted=True),
+            ),
+        )
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+        op.create_index(
+            f'ix_{table}_content_trgm', table, ['content'], unique=False,
+            postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('posts', 'comments'):
+        op.drop_index(f'ix_{table}_content_trgm', table_name=table)
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -1,41 +1,112 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import os
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+import asyncio
 from contextlib import asynccontextmanager
-from src.db.main import init_db
+from src.db.main import init_db, check_db
 from src.db.redis import redis_client
+from src.config import Config
+from src.responses import FastJSONResponse
+from src.clients import ServiceNotConfigured, registry
+from src.metrics import PrometheusMiddleware, render_metrics
+from src.db.querylog import QueryStatsMiddleware
+from src.ratelimit import RateLimitMiddleware
 from src.auth.routes import auth_router
 from src.events.routes import events_router
 from src.users.routes import user_router
 from src.chat.routes import chat_router
+from src.chat.presence import run_presence_heartbeat, run_signal_subscriber
+from src.chat.relay import run_message_subscriber
 from src.community.routes import community_router
+from src.community.realtime import run_feed_subscriber
 from src.leaderboard.routes import leaderboard_router
 from src.chatbot.routes import chatbot_router
 from src.notifications.routes import notification_router
+from src.notifications.retention import run_retention_loop
+from src.events.reminders import run_reminder_scheduler
+from src.jobs.worker import Worker
+from src.users.certificate import shutdown_render_pool
 from src.auth.fcm_routes import fcm_router
 
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print(f"🚀 Server is starting...")
+    print(f"🚀 Server is starting (startup mode: {Config.STARTUP_MODE})...")
+    timings = {"imports": IMPORT_SECONDS}
+
+    started = time.perf_counter()
     try:
-        await init_db()
-        print(f"✅ Database initialized successfully")
+        await check_db()
+        print(f"✅ Database connected successfully")
     except Exception as e:
-        print(f"⚠️ Database initialization warning: {e}")
-        # Continue anyway, tables might already exist
+        print(f"⚠️ Database connection warning: {e}")
+    timings["db_connect"] = time.perf_counter() - started
+
+    if Config.STARTUP_MODE == "full":
+        started = time.perf_counter()
+        try:
+            await init_db()
+            print(f"✅ Database initialized successfully")
+        except Exception as e:
+            print(f"⚠️ Database initialization warning: {e}")
+            # Continue anyway, tables might already exist
+        timings["schema"] = time.perf_counter() - started
     
     # Test Redis connection
+    started = time.perf_counter()
     try:
         await redis_client.ping()
         print(f"✅ Redis connected successfully")
     except Exception as e:
         print(f"⚠️ Redis connection warning: {e}")
         # Continue anyway, Redis is optional
-    
+    timings["redis_ping"] = time.perf_counter() - started
+
+    app.state.startup_timings = timings
+    print("⏱️ Startup report: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+
+    background_tasks = [
+        asyncio.create_task(run_feed_subscriber()),
+        asyncio.create_task(run_message_subscriber()),
+        asyncio.create_task(run_signal_subscriber()),
+    ]
+    if Config.CHAT_PRESENCE_HEARTBEAT_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_presence_heartbeat(Config.CHAT_PRESENCE_HEARTBEAT_SECONDS)))
+    if Config.NOTIFICATION_PRUNE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_retention_loop(Config.NOTIFICATION_PRUNE_INTERVAL_SECONDS)))
+    if Config.EVENT_REMINDER_POLL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_reminder_scheduler(Config.EVENT_REMINDER_POLL_SECONDS)))
+    job_worker = None
+    if Config.JOB_BACKEND == "redis" and Config.JOB_WORKER_EMBEDDED:
+        job_worker = Worker()
+        job_worker_task = asyncio.create_task(job_worker.run())
+
     yield
     
     # Cleanup
+    for task in background_tasks:
+        task.cancel()
+    if job_worker:
+        # Let running jobs finish; anything cut off is redelivered after the visibility timeout
+        job_worker.stop()
+        try:
+            await asyncio.wait_for(job_worker_task, timeout=Config.GRACEFUL_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("⚠️ Job worker did not stop in time")
+    shutdown_render_pool()
+    registry.reset()
     try:
         await redis_client.close()
         print(f"🔌 Redis disconnected")
@@ -51,8 +122,28 @@ app = FastAPI(
     description="A place to connect with volunteer communities and find opportunities",
     version=version,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Compress large payloads such as /events/all; small responses are sent as-is
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=Config.COMPRESSION_LEVEL,
+        minimum_size=Config.COMPRESSION_MINIMUM_SIZE,
+        gzip_fallback=True,
+    )
+else:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=Config.COMPRESSION_MINIMUM_SIZE,
+        compresslevel=Config.COMPRESSION_LEVEL,
+    )
+
+# Throttle expensive endpoints; added before CORS so 429s still carry CORS headers
+if Config.RATE_LIMIT_ENABLED and Config.RATE_LIMITS:
+    app.add_middleware(RateLimitMiddleware, policies=Config.RATE_LIMITS)
+
 # Add CORS middleware - Allow all origins since frontend will be hosted separately
 app.add_middleware(
     CORSMiddleware,
@@ -62,11 +153,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryStatsMiddleware, add_headers=Config.query_stats_headers_enabled)
+
+if Config.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+
+@app.exception_handler(ServiceNotConfigured)
+async def service_not_configured_handler(request: Request, exc: ServiceNotConfigured):
+    return FastJSONResponse(status_code=503, content={"detail": str(exc)})
+
 # Health check endpoints
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "Volunsphere API"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Volunsphere API", "version": version, "docs": "/docs"}
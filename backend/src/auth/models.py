@@ -6,6 +6,7 @@ from typing import Optional
 
 from typing import List, TYPE_CHECKING
 from sqlmodel import Relationship
+from sqlalchemy import Index, func, literal_column
 
 if TYPE_CHECKING:
     from src.community.models import Post, Comment, Like
@@ -65,4 +66,28 @@ class User(SQLModel, table=True):
 
 
     def __repr__(self):
-        return f"<User {self.username}>"
\ No newline at end of file
+        return f"<User {self.username}>"
+
+
+def user_search_document(table=None):
+    """Lower-cased "username first last city", as indexed for /users/search.
+
+    Queries must build the expression through here so it matches the index.
+    """
+    c = (table if table is not None else User.__table__).c
+    space = literal_column("' '")
+    return func.lower(c.username + space + c.first_name + space + c.last_name + space + c.city)
+
+
+# Directory search: prefix ranges on the username, fuzzy matches on the whole document
+Index(
+    "ix_users_username_lower_pattern",
+    func.lower(User.__table__.c.username).label("username_lower"),
+    postgresql_ops={"username_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_users_search_trgm",
+    user_search_document().label("search_document"),
+    postgresql_using="gin",
+    postgresql_ops={"search_document": "gin_trgm_ops"},
+)
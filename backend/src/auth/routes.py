@@ -18,8 +18,8 @@ import os
 import jwt 
 from pydantic import EmailStr
 import random
-from src.config import Config
-from supabase import create_client
+from src.clients import get_supabase
+from src.users.cache import invalidate_profiles
 from fastapi import UploadFile, File
 
 
@@ -196,6 +196,7 @@ async def update_user_profile(
 
     await session.commit()
     await session.refresh(user)
+    await invalidate_profiles([user.uid])
 
     return user
 
@@ -265,12 +266,7 @@ async def reset_password(payload: ResetPasswordRequest, session: AsyncSession =
 
     return {"message": "Password reset successful."}
 
- 
 
-supabase = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
-
-
- 
 
 @auth_router.post("/upload-profile-image")
 async def upload_profile_image(
@@ -300,7 +296,7 @@ async def upload_profile_image(
 
     print(f"Uploading file: {file.filename}, size: {len(file_content)} bytes, content_type: {file.content_type}")
 
-     
+    supabase = get_supabase()
     response = supabase.storage.from_("profile-images").upload(
         file_name,
         file_content,
@@ -317,6 +313,7 @@ async def upload_profile_image(
     user.profile_image_url = public_url
     await session.commit()
     await session.refresh(user)
+    await invalidate_profiles([user.uid])
 
     return {
         "message": "Profile image uploaded successfully",
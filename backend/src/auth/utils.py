@@ -13,6 +13,7 @@ from email.mime.text import MIMEText
 import random
 from src.config import Config
 from src.db.redis import redis_client
+from src.clients import get_mailer
 
 
 
@@ -118,6 +119,4 @@ The VolunSphere Team
     msg['From'] = Config.GMAIL_USER
     msg['To'] = recipient_email
 
-    with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-        server.login(Config.GMAIL_USER, Config.GMAIL_PASSWORD)
-        server.send_message(msg)
+    get_mailer().send_message(msg)
@@ -0,0 +1,205 @@
+"""Chat room presence and typing indicators.
+
+Presence lives in Redis so every worker sees the same rooms: one sorted set per
+event whose members are "{user_id}:{connection_id}", scored by when they expire.
+Each worker refreshes the connections it holds every CHAT_PRESENCE_HEARTBEAT_SECONDS,
+so the connections of a worker that died drop out after CHAT_PRESENCE_TTL_SECONDS.
+
+Joins, leaves and typing events are relayed between workers over pub/sub and
+delivered only to sockets that connected with ?signals=true, because older
+clients render every frame as a chat message. None of this touches Postgres.
+"""
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from src.config import Config
+from src.db.redis import redis_client
+
+SIGNAL_CHANNEL = "chat:signals"
+RESUBSCRIBE_DELAY_SECONDS = 1
+# Typing events from one connection are relayed at most this often
+TYPING_THROTTLE_SECONDS = 2
+
+# Drop expired connections (score <= ARGV[1]), add connection ARGV[4] of user ARGV[3]
+# until ARGV[2] and remember their name ARGV[5]. Returns 1 if the user just came online.
+_JOIN = redis_client.register_script("""
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local prefix = ARGV[3] .. ':'
+local online = 0
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    if string.sub(member, 1, #prefix) == prefix then
+        online = 1
+        break
+    end
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+redis.call('HSET', KEYS[2], ARGV[3], ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+return 1 - online
+""")
+
+# Remove connection ARGV[3] of user ARGV[2]. Returns 1 if the user has no connection left.
+_LEAVE = redis_client.register_script("""
+redis.call('ZREM', KEYS[1], ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local prefix = ARGV[2] .. ':'
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    if string.sub(member, 1, #prefix) == prefix then
+        return 0
+    end
+end
+redis.call('HDEL', KEYS[2], ARGV[2])
+return 1
+""")
+
+# Flat [user_id, username, ...] of everyone with a live connection
+_OCCUPANCY = redis_client.register_script("""
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local seen = {}
+local result = {}
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    local user_id = string.match(member, '^([^:]+)')
+    if not seen[user_id] then
+        seen[user_id] = true
+        table.insert(result, user_id)
+        table.insert(result, redis.call('HGET', KEYS[2], user_id) or '')
+    end
+end
+return result
+""")
+
+# room -> connection member -> (user_id, username), refreshed by the heartbeat
+_connections: Dict[str, Dict[str, Tuple[str, str]]] = {}
+# room -> sockets that asked for presence and typing events
+_listeners: Dict[str, Set[WebSocket]] = {}
+
+
+def _presence_key(room: str) -> str:
+    return f"chat:presence:{room}"
+
+
+def _names_key(room: str) -> str:
+    return f"chat:presence:{room}:names"
+
+
+async def _publish(room: str, payload: dict) -> None:
+    try:
+        await redis_client.publish(SIGNAL_CHANNEL, json.dumps({"room": room, "data": json.dumps(payload)}))
+    except Exception as e:
+        print(f"⚠️ Chat signal publish failed: {e}")
+
+
+async def join_room(room: str, user_id: str, username: str, listener: Optional[WebSocket] = None) -> str:
+    """Mark a new connection online and return its member id for leave_room."""
+    member = f"{user_id}:{uuid.uuid4().hex}"
+    _connections.setdefault(room, {})[member] = (user_id, username)
+    if listener is not None:
+        _listeners.setdefault(room, set()).add(listener)
+
+    now = time.time()
+    try:
+        came_online = await _JOIN(
+            keys=[_presence_key(room), _names_key(room)],
+            args=[now, now + Config.CHAT_PRESENCE_TTL_SECONDS, user_id, member, username, Config.CHAT_PRESENCE_TTL_SECONDS],
+        )
+    except Exception as e:
+        print(f"⚠️ Presence join failed for room {room}: {e}")
+        return member
+    if came_online:
+        await _publish(room, {"type": "presence", "user_id": user_id, "username": username, "online": True})
+    return member
+
+
+async def leave_room(room: str, member: str, listener: Optional[WebSocket] = None) -> None:
+    user_id, username = _connections.get(room, {}).pop(member, (member.split(":")[0], ""))
+    if not _connections.get(room):
+        _connections.pop(room, None)
+    if listener is not None and room in _listeners:
+        _listeners[room].discard(listener)
+        if not _listeners[room]:
+            del _listeners[room]
+
+    try:
+        went_offline = await _LEAVE(keys=[_presence_key(room), _names_key(room)], args=[time.time(), user_id, member])
+    except Exception as e:
+        print(f"⚠️ Presence leave failed for room {room}: {e}")
+        return
+    if went_offline:
+        await _publish(room, {"type": "presence", "user_id": user_id, "username": username, "online": False})
+
+
+async def get_occupancy(room: str) -> List[dict]:
+    flat = await _OCCUPANCY(keys=[_presence_key(room), _names_key(room)], args=[time.time()])
+    return [{"user_id": flat[i], "username": flat[i + 1]} for i in range(0, len(flat), 2)]
+
+
+async def publish_typing(room: str, user_id: str, username: str, typing: bool = True) -> None:
+    await _publish(room, {"type": "typing", "user_id": user_id, "username": username, "typing": typing})
+
+
+def parse_signal(text: str) -> Optional[dict]:
+    """Return the frame if it is a client signal such as {"type": "typing"}, else None."""
+    if not text.startswith("{"):
+        return None
+    try:
+        frame = json.loads(text)
+    except ValueError:
+        return None
+    if isinstance(frame, dict) and frame.get("type") == "typing":
+        return frame
+    return None
+
+
+async def _deliver(room: str, message: str) -> None:
+    for websocket in list(_listeners.get(room, ())):
+        try:
+            await websocket.send_text(message)
+        except Exception:
+            # The chat handler cleans up when its receive loop notices the close
+            _listeners.get(room, set()).discard(websocket)
+
+
+async def run_presence_heartbeat(interval: int) -> None:
+    print("💓 Chat presence heartbeat started")
+    while True:
+        await asyncio.sleep(interval)
+        if not _connections:
+            continue
+        expires_at = time.time() + Config.CHAT_PRESENCE_TTL_SECONDS
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for room, members in list(_connections.items()):
+                    pipe.zadd(_presence_key(room), {member: expires_at for member in members})
+                    pipe.hset(_names_key(room), mapping={user_id: username for user_id, username in members.values()})
+                    pipe.expire(_presence_key(room), Config.CHAT_PRESENCE_TTL_SECONDS)
+                    pipe.expire(_names_key(room), Config.CHAT_PRESENCE_TTL_SECONDS)
+                await pipe.execute()
+        except Exception as e:
+            print(f"⚠️ Chat presence heartbeat failed: {e}")
+
+
+async def run_signal_subscriber() -> None:
+    print("📡 Chat signal subscriber started")
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(SIGNAL_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                signal = json.loads(message["data"])
+                if signal["room"] in _listeners:
+                    await _deliver(signal["room"], signal["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Chat signal subscriber error, resubscribing: {e}")
+            await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+        finally:
+            await pubsub.aclose()
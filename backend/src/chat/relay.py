@@ -0,0 +1,47 @@
+"""Chat message fan-out across workers.
+
+A room's sockets can be spread over several worker processes, so new messages
+are published to one Redis pub/sub channel instead of being broadcast from the
+worker that received them. Every worker runs a subscriber that forwards each
+message to the sockets it holds for that room.
+"""
+import asyncio
+import json
+
+from src.chat.websocket_manager import WebSocketManager
+from src.db.redis import redis_client
+
+MESSAGE_CHANNEL = "chat:messages"
+RESUBSCRIBE_DELAY_SECONDS = 1
+
+manager = WebSocketManager()
+
+
+async def publish_message(room: str, message: str) -> None:
+    try:
+        await redis_client.publish(MESSAGE_CHANNEL, json.dumps({"room": room, "data": message}))
+    except Exception as e:
+        # Without Redis only this worker's sockets get it, which beats nobody
+        print(f"⚠️ Chat message publish failed, broadcasting locally: {e}")
+        await manager.broadcast(room, message)
+
+
+async def run_message_subscriber() -> None:
+    print("📡 Chat message subscriber started")
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(MESSAGE_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                relayed = json.loads(message["data"])
+                if relayed["room"] in manager.active_connections:
+                    await manager.broadcast(relayed["room"], relayed["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Chat message subscriber error, resubscribing: {e}")
+            await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+        finally:
+            await pubsub.aclose()
@@ -1,41 +1,79 @@
-from src.chat.models import ChatMessage
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from datetime import datetime, timezone
-from src.db.main import get_session
-
-
-from src.chat.websocket_manager import WebSocketManager
-from src.auth.dependencies import AccessTokenFromWSBearer
-from src.events.models import Event, EventResponse
-from sqlalchemy import or_
-from fastapi import WebSocket, WebSocketDisconnect, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
-from sqlalchemy import or_
+import time
 import uuid
 import json
-from src.notifications.models import Notification
-from src.notifications.fcm import send_fcm_push
+from src.notifications.jobs import send_coalesced
+from src.notifications.service import create_notifications, get_fcm_tokens
+from src.notifications.unread import increment_unread_counts
 
 from src.chat.models import ChatMessage
-from src.chat.websocket_manager import WebSocketManager
-from src.db.main import get_session
-from src.auth.dependencies import AccessTokenFromWSBearer
+from src.chat.presence import (
+    TYPING_THROTTLE_SECONDS, get_occupancy, join_room, leave_room, parse_signal, publish_typing,
+)
+from src.chat.relay import manager, publish_message
+from src.db.main import async_session_maker, get_session
+from src.auth.dependencies import AccessTokenFromWSBearer, AccessTokenBearer
 from src.events.models import Event, EventResponse
-from src.auth.models import User
+from src.events.membership import is_event_member
+from src.users.cache import get_profiles
+from src.exports import ExportFormat, export_response
+from src.ratelimit import RatePolicy, rate_limiter
+from src.config import Config
 
-manager = WebSocketManager()
+CHAT_MESSAGE_POLICY = RatePolicy.parse(Config.CHAT_MESSAGE_RATE_LIMIT)
 
 chat_router = APIRouter()
 
+async def _notify_chat_message(event_id: uuid.UUID, sender_id: uuid.UUID, username: str, text: str) -> None:
+    async with async_session_maker() as session:
+        # Find all event attendees except sender
+        attendees_stmt = select(EventResponse.user_id).where(
+            EventResponse.event_id == event_id,
+            EventResponse.user_id != sender_id
+        )
+        attendees_result = await session.exec(attendees_stmt)
+        attendee_ids = attendees_result.all()
+        # Also notify event creator if not sender
+        event_obj = await session.get(Event, event_id)
+        if event_obj and event_obj.creator_id != sender_id:
+            attendee_ids.append(event_obj.creator_id)
+        # Remove duplicates
+        attendee_ids = list(set(attendee_ids))
+        # Unread chat notifications roll up into one row per (recipient, event)
+        notifications = await create_notifications(
+            session,
+            attendee_ids,
+            message=f"New message from {username}: {text}",
+            type="chat_message",
+            event_id=str(event_id),
+            event_title=event_obj.title if event_obj else '',
+        )
+        tokens = await get_fcm_tokens(session, attendee_ids)
+        await session.commit()
+
+    event_title = event_obj.title if event_obj else "the event chat"
+    await send_coalesced.enqueue(
+        {str(user_id): token for user_id, token in tokens.items()},
+        topic=f"{event_id}:chat_message",
+        title="New Chat Message",
+        body=f"{username}: {text}",
+        summary="{count} new messages in " + event_title,
+        data={"type": "chat_message", "event_id": str(event_id)},
+    )
+    await increment_unread_counts(n.user_id for n in notifications if n.count == 1)
+
+
+# Sockets live for hours, so nothing here holds a session between operations:
+# each database step checks a connection out of the pool and returns it at once.
 @chat_router.websocket("/ws/{event_id}")
 async def chat_ws(
     websocket: WebSocket,
     event_id: str,
+    signals: bool = False,
     user: dict = Depends(AccessTokenFromWSBearer()),
-    session: AsyncSession = Depends(get_session)
 ):
     try:
         event_uuid = uuid.UUID(event_id)
@@ -45,46 +83,44 @@ async def chat_ws(
 
     user_uuid = uuid.UUID(user["sub"])   
 
-    
-    user_obj = await session.get(User, user_uuid)
-    if not user_obj:
+    # One Redis lookup on the hot path; Postgres is only read to rebuild the cached set
+    if not await is_event_member(event_uuid, user_uuid):
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    
-    stmt = select(Event).where(
-        Event.id == event_uuid,
-        or_(
-            Event.creator_id == user_uuid,
-            Event.id.in_(
-                select(EventResponse.event_id).where(EventResponse.user_id == user_uuid)
-            )
-        )
-    )
-    result = await session.exec(stmt)
-    if not result.first():
+    # The session only touches the pool when the profile is not cached
+    async with async_session_maker() as session:
+        profile = (await get_profiles(session, [user_uuid])).get(user_uuid)
+    if not profile:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
+    # The email comes from the token, the same value clients use to spot their own messages
+    email = user["email"]
 
-    
-    await manager.connect(event_id, websocket)
-
-     
-    result = await session.exec(
-        select(ChatMessage)
-        .where(ChatMessage.event_id == event_uuid)
-        .order_by(ChatMessage.timestamp.asc())
-    )
-    past_messages = result.all()
-    for msg in past_messages:
-        await websocket.send_text(json.dumps({
-            "username": msg.username,
-            "email": msg.email,
-            "message": msg.message,
-            "timestamp": msg.timestamp.isoformat()
-        }))
+    room = str(event_uuid)
+    presence_member = None
+    last_typing = 0.0
 
     try:
+        await manager.connect(room, websocket)
+        presence_member = await join_room(room, str(user_uuid), profile.username, websocket if signals else None)
+
+        # Load first, send after the connection is back in the pool
+        async with async_session_maker() as session:
+            result = await session.exec(
+                select(ChatMessage)
+                .where(ChatMessage.event_id == event_uuid)
+                .order_by(ChatMessage.timestamp.asc())
+            )
+            past_messages = result.all()
+        for msg in past_messages:
+            await websocket.send_text(json.dumps({
+                "username": msg.username,
+                "email": msg.email,
+                "message": msg.message,
+                "timestamp": msg.timestamp.isoformat()
+            }))
+
         while True:
              
             text = await websocket.receive_text()
@@ -93,20 +129,40 @@ async def chat_ws(
             if not text:
                 continue
 
-            
+            # Typing indicators are relayed to the room but never stored
+            signal = parse_signal(text)
+            if signal is not None:
+                typing = signal.get("typing", True) is not False
+                if typing and time.monotonic() - last_typing < TYPING_THROTTLE_SECONDS:
+                    continue
+                last_typing = time.monotonic() if typing else 0.0
+                await publish_typing(room, str(user_uuid), profile.username, typing)
+                continue
+
+            limit = await rate_limiter.hit(f"chat:{event_uuid}:{user_uuid}", CHAT_MESSAGE_POLICY)
+            if not limit.allowed:
+                # Dropped, not persisted or broadcast; the sender is told when to retry
+                await websocket.send_text(json.dumps({
+                    "error": "rate_limited",
+                    "retry_after": limit.retry_after,
+                }))
+                continue
+
             chat_msg = ChatMessage(
                 event_id=event_uuid,
                 user_id=user_uuid,
-                username=user_obj.username,
-                email=user_obj.email,
+                username=profile.username,
+                email=email,
                 message=text,
                 timestamp = datetime.now(timezone.utc) # Use UTC for consistency,
             )
-            session.add(chat_msg)
-            await session.commit()
+            async with async_session_maker() as session:
+                session.add(chat_msg)
+                await session.commit()
 
              
-            await manager.broadcast(event_id, json.dumps({
+            # Relayed through Redis so sockets on other workers get it too
+            await publish_message(room, json.dumps({
                 "username": chat_msg.username,
                 "email": chat_msg.email,
                 "message": chat_msg.message,
@@ -114,57 +170,32 @@ async def chat_ws(
             }))
 
             # --- Notification and FCM push for chat message ---
-            # Find all event attendees except sender
-            attendees_stmt = select(EventResponse.user_id).where(
-                EventResponse.event_id == event_uuid,
-                EventResponse.user_id != user_uuid
-            )
-            attendees_result = await session.exec(attendees_stmt)
-            attendee_ids = attendees_result.all()
-            # Also notify event creator if not sender
-            event_obj = await session.get(Event, event_uuid)
-            if event_obj and event_obj.creator_id != user_uuid:
-                attendee_ids.append(event_obj.creator_id)
-            # Remove duplicates
-            attendee_ids = list(set(attendee_ids))
-            for recipient_id in attendee_ids:
-                recipient = await session.get(User, recipient_id)
-                if recipient:
-                    # Create notification in DB
-                    notification = Notification(
-                        user_id=recipient.uid,
-                        event_id=str(event_uuid),
-                        event_title=event_obj.title if event_obj else '',
-                        message=f"New message from {user_obj.username}: {text}",
-                        is_read=False,
-                        type="chat_message"
-                    )
-                    session.add(notification)
-                    await session.commit()
-                    # Send FCM push if token exists
-                    if recipient.fcm_token:
-                        try:
-                            send_fcm_push(
-                                token=recipient.fcm_token,
-                                title="New Chat Message",
-                                body=f"{user_obj.username}: {text}",
-                                data={"type": "chat_message", "event_id": str(event_uuid)}
-                            )
-                        except Exception as e:
-                            print(f"FCM push failed: {e}")
+            await _notify_chat_message(event_uuid, user_uuid, profile.username, text)
 
     except WebSocketDisconnect:
-        manager.disconnect(event_id, websocket)
+        manager.disconnect(room, websocket)
 
     except Exception as e:
-        manager.disconnect(event_id, websocket)
+        manager.disconnect(room, websocket)
         print(f"[WebSocket Error] {e}")
         await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
 
+    finally:
+        if presence_member is not None:
+            await leave_room(room, presence_member, websocket if signals else None)
+
  
+@chat_router.get("/{event_id}/presence")
+async def get_chat_presence(event_id: uuid.UUID, token_data: dict = Depends(AccessTokenBearer())):
+    # Who is online is no more public than the room itself
+    if not await is_event_member(event_id, uuid.UUID(token_data["sub"])):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    users = await get_occupancy(str(event_id))
+    return {"event_id": event_id, "online": len(users), "users": users}
+
 
 @chat_router.get("/{event_id}/messages")
-async def get_chat_messages(event_id: str, session: AsyncSession = Depends(get_session)):
+async def get_chat_messages(event_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
     result = await session.exec(
         select(ChatMessage)
         .where(ChatMessage.event_id == event_id)
@@ -179,3 +210,27 @@ async def get_chat_messages(event_id: str, session: AsyncSession = Depends(get_s
             "timestamp": m.timestamp.isoformat()
         } for m in messages
     ]
+
+
+CHAT_EXPORT_COLUMNS = ["timestamp", "user_id", "username", "email", "message"]
+
+
+@chat_router.get("/{event_id}/messages/export")
+async def export_chat_messages(
+    event_id: uuid.UUID,
+    format: ExportFormat = "csv",
+    token_data: dict = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    event = await session.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event.creator_id != uuid.UUID(token_data["sub"]):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    stmt = (
+        select(ChatMessage.timestamp, ChatMessage.user_id, ChatMessage.username, ChatMessage.email, ChatMessage.message)
+        .where(ChatMessage.event_id == event_id)
+        .order_by(ChatMessage.timestamp, ChatMessage.id)
+    )
+    return export_response(stmt, CHAT_EXPORT_COLUMNS, format, f"chat-{event_id}")
@@ -1,10 +1,12 @@
 from typing import Dict, Set
 from fastapi import WebSocket, WebSocketDisconnect
+from src.metrics import WS_CONNECTIONS, WS_ROOMS
 
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(self, channel: str = "chat"):
      
+        self.channel = channel
         self.active_connections: Dict[str, Set[WebSocket]] = {}
 
     async def connect(self, room: str, websocket: WebSocket):
@@ -12,6 +14,7 @@ class WebSocketManager:
         if room not in self.active_connections:
             self.active_connections[room] = set()
         self.active_connections[room].add(websocket)
+        self._observe()
 
     def disconnect(self, room: str, websocket: WebSocket):
         connections = self.active_connections.get(room)
@@ -19,6 +22,11 @@ class WebSocketManager:
             connections.discard(websocket)
             if not connections:
                 del self.active_connections[room]
+            self._observe()
+
+    def _observe(self):
+        WS_CONNECTIONS.labels(self.channel).set(sum(len(c) for c in self.active_connections.values()))
+        WS_ROOMS.labels(self.channel).set(len(self.active_connections))
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         try:
@@ -1,20 +1,16 @@
-from openai import OpenAI
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import text
 from src.db.main import get_session
 from src.auth.dependencies import AccessTokenBearer
-from src.config import Config
+from src.clients import get_llm_client
+from src.metrics import LLM_LATENCY
+import time
 
 chatbot_router = APIRouter()
 
 ALLOWED_TABLES = ["users", "events","event_responses"]
 
- 
-client = OpenAI(
-    api_key=Config.GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1"
-)
 
 @chatbot_router.post("/query")
 async def query_chatbot(
@@ -55,8 +51,9 @@ User question: "{question}"
 
 SQL:"""
 
+    llm_started = time.perf_counter()
     try:
-        response = client.chat.completions.create(
+        response = get_llm_client().chat.completions.create(
             model="llama3-8b-8192",  # Or "llama3-70b-8192"
             messages=[
                 {"role": "system", "content": "You are a PostgreSQL SQL generator."},
@@ -64,6 +61,7 @@ SQL:"""
             ],
             temperature=0.2,
         )
+        LLM_LATENCY.labels("success").observe(time.perf_counter() - llm_started)
         generated_sql = response.choices[0].message.content.strip()
         
         # Clean up the SQL (remove any markdown formatting)
@@ -73,6 +71,7 @@ SQL:"""
             generated_sql = generated_sql.replace("```", "").strip()
             
     except Exception as e:
+        LLM_LATENCY.labels("error").observe(time.perf_counter() - llm_started)
         return {
             "success": False,
             "question": question,
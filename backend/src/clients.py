@@ -0,0 +1,132 @@
+import json
+import smtplib
+import threading
+from typing import Any, Callable, Dict
+
+from src.config import Config
+
+
+class ServiceNotConfigured(RuntimeError):
+    """Raised when an external client is requested but its settings are missing."""
+
+
+class ClientRegistry:
+    """Builds external clients lazily on first use and shares them across modules."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def factory(self, name: str):
+        def decorator(fn: Callable[[], Any]):
+            self._factories[name] = fn
+            return fn
+        return decorator
+
+    def get(self, name: str) -> Any:
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = self._factories[name]()
+            return self._clients[name]
+
+    def override(self, name: str, client: Any) -> None:
+        """Replace a client, e.g. with a local stand-in for tests and benchmarks."""
+        with self._lock:
+            self._clients[name] = client
+
+    def reset(self, name: str = None) -> None:
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(name, None)
+
+
+registry = ClientRegistry()
+
+
+@registry.factory("supabase")
+def _build_supabase():
+    if not Config.SUPABASE_URL or not Config.SUPABASE_KEY:
+        raise ServiceNotConfigured("Supabase storage is not configured")
+    from supabase import create_client
+    return create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+
+
+@registry.factory("llm")
+def _build_llm():
+    if not Config.GROQ_API_KEY:
+        raise ServiceNotConfigured("The chatbot LLM is not configured")
+    from openai import OpenAI
+    return OpenAI(
+        api_key=Config.GROQ_API_KEY,
+        base_url="https://api.groq.com/openai/v1"
+    )
+
+
+class FirebaseMessaging:
+    """Thin wrapper so FCM sends go through a registry-managed firebase app."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def send(self, message):
+        from firebase_admin import messaging
+        return messaging.send(message, app=self.app)
+
+    def send_each_for_multicast(self, message):
+        from firebase_admin import messaging
+        return messaging.send_each_for_multicast(message, app=self.app)
+
+
+@registry.factory("fcm")
+def _build_fcm():
+    if not Config.FIREBASE_CREDENTIALS_JSON:
+        raise ServiceNotConfigured("Firebase Cloud Messaging is not configured")
+    import firebase_admin
+    from firebase_admin import credentials
+
+    if firebase_admin._apps:
+        return FirebaseMessaging(firebase_admin.get_app())
+    cred = credentials.Certificate(json.loads(Config.FIREBASE_CREDENTIALS_JSON))
+    return FirebaseMessaging(firebase_admin.initialize_app(cred))
+
+
+class SMTPMailer:
+    def __init__(self, host: str, port: int, user: str, password: str):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+
+    def send_message(self, msg):
+        with smtplib.SMTP_SSL(self.host, self.port) as server:
+            server.login(self.user, self.password)
+            server.send_message(msg)
+
+
+@registry.factory("mailer")
+def _build_mailer():
+    if not Config.GMAIL_USER or not Config.GMAIL_PASSWORD:
+        raise ServiceNotConfigured("Email delivery is not configured")
+    return SMTPMailer("smtp.gmail.com", 465, Config.GMAIL_USER, Config.GMAIL_PASSWORD)
+
+
+def get_supabase():
+    return registry.get("supabase")
+
+
+def get_llm_client():
+    return registry.get("llm")
+
+
+def get_fcm():
+    return registry.get("fcm")
+
+
+def get_mailer():
+    return registry.get("mailer")
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field, Column, Relationship
-from sqlalchemy import ForeignKey  # ✅ Use this
+from sqlalchemy import ForeignKey, Computed, Index  # ✅ Use this
 import sqlalchemy.dialects.postgresql as pg
 from typing import Optional, List
 import uuid
@@ -72,5 +72,18 @@ class Like(SQLModel, table=True):
 
     post: Optional[Post] = Relationship(back_populates="likes")
     comment: Optional[Comment] = Relationship(back_populates="likes")
-    user: Optional["User"] = Relationship(back_populates="likes")   
+    user: Optional["User"] = Relationship(back_populates="likes")
 
+
+# Full-text documents and trigram indexes for /community/search. The tsvector
+# columns are maintained by Postgres and left unmapped, so the ORM never writes them.
+for _model in (Post, Comment):
+    _table = _model.__table__
+    _table.append_column(
+        Column("search_vector", pg.TSVECTOR, Computed("to_tsvector('english', content)", persisted=True))
+    )
+    Index(f"ix_{_table.name}_search_vector", _table.c.search_vector, postgresql_using="gin")
+    Index(
+        f"ix_{_table.name}_content_trgm", _table.c.content,
+        postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"},
+    )
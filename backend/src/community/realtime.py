@@ -0,0 +1,46 @@
+"""Realtime community feed.
+
+Routes publish small diff events (a new post, a like-count delta, a new comment)
+to one Redis pub/sub channel. Every worker runs a subscriber that forwards them
+to the feed sockets it holds, so clients subscribe once instead of polling
+GET /community/posts.
+"""
+import asyncio
+import json
+
+from src.chat.websocket_manager import WebSocketManager
+from src.db.redis import redis_client
+
+FEED_CHANNEL = "community:feed"
+FEED_ROOM = "feed"
+RESUBSCRIBE_DELAY_SECONDS = 1
+
+manager = WebSocketManager(channel="community")
+
+
+async def publish_feed_event(event_type: str, **fields) -> None:
+    message = json.dumps({"type": event_type, **fields}, separators=(",", ":"), default=str)
+    try:
+        await redis_client.publish(FEED_CHANNEL, message)
+    except Exception as e:
+        # Without Redis only this worker's clients hear about it, which beats nobody
+        print(f"⚠️ Community feed publish failed, broadcasting locally: {e}")
+        await manager.broadcast(FEED_ROOM, message)
+
+
+async def run_feed_subscriber() -> None:
+    print("📡 Community feed subscriber started")
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(FEED_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message" and FEED_ROOM in manager.active_connections:
+                    await manager.broadcast(FEED_ROOM, message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Community feed subscriber error, resubscribing: {e}")
+            await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+        finally:
+            await pubsub.aclose()
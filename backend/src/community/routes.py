@@ -2,30 +2,45 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import select, SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List
+from sqlalchemy import Float, and_, cast, func, literal, or_, union_all
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from src.auth.dependencies import AccessTokenBearer
+from src.auth.dependencies import AccessTokenBearer, AccessTokenFromWSBearer
 from src.db.main import get_session
 from src.community.models import Post, Comment, Like
 from src.community.schemas import PostCreate, PostRead, CommentCreate, CommentRead
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from src.chat.websocket_manager import WebSocketManager
+from src.community.realtime import FEED_ROOM, manager, publish_feed_event
 from src.community.schemas import PostCreate, PostRead, CommentCreate, CommentRead,UserRead
 from sqlalchemy.orm import selectinload
 from src.auth.utils import decode_token
 from datetime import datetime
 from fastapi import Query
+import html
 import json
-from src.community.schemas import PostUpdate, CommentUpdate
+from src.community.schemas import PostUpdate, CommentUpdate, CommunitySearchHit, CommunitySearchPage
+from src.auth.models import User
+from src.pagination import encode_cursor, decode_cursor, MAX_PAGE_SIZE
+from src.search import SEARCH_REGCONFIG, prefix_tsquery
 
  
 
 community_router = APIRouter()
 
 
-manager = WebSocketManager()
+@community_router.websocket("/ws")
+async def community_feed_ws(websocket: WebSocket, user: dict = Depends(AccessTokenFromWSBearer())):
+    await manager.connect(FEED_ROOM, websocket)
+    try:
+        while True:
+            # The feed is push-only; incoming frames just keep the connection alive
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(FEED_ROOM, websocket)
 
 
 @community_router.post("/posts", response_model=PostRead)
@@ -40,7 +55,9 @@ async def create_post(
     await session.commit()
     await session.refresh(post)
 
-    return await get_post(post.id, session)
+    created = await get_post(post.id, session)
+    await publish_feed_event("post_created", post=created.model_dump(mode="json", exclude={"liked_by_me"}))
+    return created
 
 
 from sqlalchemy.orm import selectinload
@@ -82,6 +99,103 @@ async def list_posts(
 
 
 
+# ts_headline marks matches with private-use characters; the snippet is HTML-escaped
+# before they become <mark> tags, so user text can never inject markup
+SNIPPET_START = "\ue000"
+SNIPPET_STOP = "\ue001"
+SNIPPET_OPTIONS = f'StartSel="{SNIPPET_START}", StopSel="{SNIPPET_STOP}", MaxWords=35, MinWords=15, MaxFragments=2'
+
+
+def render_snippet(snippet: str) -> str:
+    escaped = html.escape(snippet)
+    return escaped.replace(SNIPPET_START, "<mark>").replace(SNIPPET_STOP, "</mark>")
+
+
+def _search_hits(model, kind: str, post_id_column, tsquery, text_query: str):
+    """Posts or comments matching the full-text query or fuzzily matching the raw text."""
+    search_vector = model.__table__.c.search_vector
+    score = cast(func.ts_rank(search_vector, tsquery) + func.word_similarity(text_query, model.content), Float)
+    return (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            post_id_column.label("post_id"),
+            model.user_id.label("user_id"),
+            model.content.label("content"),
+            model.created_at.label("created_at"),
+            score.label("score"),
+        )
+        .where(or_(search_vector.op("@@")(tsquery), literal(text_query).op("<%")(model.content)))
+    )
+
+
+@community_router.get("/search", response_model=CommunitySearchPage)
+async def search_community(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[Literal["post", "comment"]] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    tsquery = prefix_tsquery(q)
+    if tsquery is None:
+        return {"items": [], "next_cursor": None}
+    text_query = q.strip()
+
+    parts = []
+    if kind in (None, "post"):
+        parts.append(_search_hits(Post, "post", Post.id, tsquery, text_query))
+    if kind in (None, "comment"):
+        parts.append(_search_hits(Comment, "comment", Comment.post_id, tsquery, text_query))
+    hits = union_all(*parts).subquery("hits") if len(parts) > 1 else parts[0].subquery("hits")
+
+    page = select(hits)
+    if cursor:
+        last_score, last_id = decode_cursor(cursor, 2)
+        try:
+            last_score, last_id = float(last_score), UUID(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = page.where(or_(hits.c.score < last_score, and_(hits.c.score == last_score, hits.c.id > last_id)))
+    page = page.order_by(hits.c.score.desc(), hits.c.id).limit(limit + 1).subquery("page")
+
+    # Snippets are built by Postgres, and only for the rows on this page
+    stmt = select(
+        page.c.kind, page.c.id, page.c.post_id, page.c.user_id, page.c.created_at, page.c.score,
+        func.ts_headline(SEARCH_REGCONFIG, page.c.content, tsquery, SNIPPET_OPTIONS).label("snippet"),
+    ).order_by(page.c.score.desc(), page.c.id)
+    rows = (await session.exec(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].score, str(rows[-1].id))
+
+    # Authors for the whole page in one query
+    author_ids = {row.user_id for row in rows}
+    authors = {}
+    if author_ids:
+        users = await session.exec(select(User).where(User.uid.in_(author_ids)))
+        authors = {user.uid: UserRead.model_validate(user) for user in users.all()}
+
+    return {
+        "items": [
+            CommunitySearchHit(
+                kind=row.kind,
+                id=row.id,
+                post_id=row.post_id,
+                user_id=row.user_id,
+                user=authors.get(row.user_id),
+                snippet=render_snippet(row.snippet),
+                created_at=row.created_at,
+                score=row.score,
+            )
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
 @community_router.get("/posts/{post_id}", response_model=PostRead)
 async def get_post(post_id: UUID, session: AsyncSession = Depends(get_session)):
     stmt = (
@@ -128,6 +242,7 @@ async def comment_post(
     # Load user eagerly
     await session.refresh(comment, attribute_names=["user"])
 
+    await publish_feed_event("comment_created", comment=CommentRead.model_validate(comment).model_dump(mode="json"))
     return comment
 
 
@@ -156,6 +271,7 @@ async def like_post(
     like = Like(post_id=post_id, user_id=user_id)
     session.add(like)
     await session.commit()
+    await publish_feed_event("post_likes", post_id=post_id, delta=1)
     return {"message": "Liked post"}
 
 
@@ -173,6 +289,7 @@ async def unlike_post(
 
     await session.delete(like)
     await session.commit()
+    await publish_feed_event("post_likes", post_id=post_id, delta=-1)
     return {"message": "Unliked post"}
 
 
@@ -190,6 +307,7 @@ async def delete_post(
         raise HTTPException(status_code=403, detail="Not authorized to delete this post")
     await session.delete(post)
     await session.commit()
+    await publish_feed_event("post_deleted", post_id=post_id)
     return {"message": "Post deleted successfully"}
 
 
@@ -212,6 +330,7 @@ async def delete_comment(
 
     await session.delete(comment)
     await session.commit()
+    await publish_feed_event("comment_deleted", post_id=post_id, comment_id=comment_id)
     return {"message": "Comment deleted successfully"}
 
 
@@ -237,6 +356,7 @@ async def edit_post(
     session.add(post)
     await session.commit()
     await session.refresh(post)
+    await publish_feed_event("post_updated", post_id=post_id, content=post.content, updated_at=post.updated_at.isoformat())
     return await get_post(post.id, session)
 
 # Edit comment route
@@ -261,4 +381,5 @@ async def edit_comment(
     await session.commit()
     await session.refresh(comment)
     await session.refresh(comment, attribute_names=["user"])
-    return comment
\ No newline at end of file
+    await publish_feed_event("comment_updated", post_id=post_id, comment_id=comment_id, content=comment.content)
+    return comment
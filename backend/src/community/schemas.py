@@ -1,7 +1,7 @@
 
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 from uuid import UUID
 
@@ -66,4 +66,20 @@ class PostUpdate(BaseModel):
     content: str
 
 class CommentUpdate(BaseModel):
-    content: str
\ No newline at end of file
+    content: str
+
+
+class CommunitySearchHit(BaseModel):
+    kind: Literal["post", "comment"]
+    id: UUID
+    post_id: UUID
+    user_id: UUID
+    user: Optional[UserRead] = None
+    snippet: str  # HTML-escaped content with matches wrapped in <mark></mark>
+    created_at: datetime
+    score: float
+
+
+class CommunitySearchPage(BaseModel):
+    items: List[CommunitySearchHit]
+    next_cursor: Optional[str] = None
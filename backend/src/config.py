@@ -1,8 +1,14 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Dict, Optional
 import os
+import tempfile
 
 class Settings(BaseSettings):
     DATABASE_URL : str
+    # SQLAlchemy pool per worker process; checkouts wait POOL_TIMEOUT seconds for a free connection
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     
@@ -11,19 +17,116 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     
-    GMAIL_USER: str
-    GMAIL_PASSWORD: str
-    SUPABASE_URL: str
-    SUPABASE_KEY: str
-    GROQ_API_KEY: str
-    GEMINI_API_KEY: str
+    # External services are optional; their clients are built on first use (see src/clients.py)
+    GMAIL_USER: Optional[str] = None
+    GMAIL_PASSWORD: Optional[str] = None
+    SUPABASE_URL: Optional[str] = None
+    SUPABASE_KEY: Optional[str] = None
+    GROQ_API_KEY: Optional[str] = None
+    GEMINI_API_KEY: Optional[str] = None
+    FIREBASE_CREDENTIALS_JSON: Optional[str] = None
     ENVIRONMENT: str = "development"
 
+    # "full" applies migrations at boot (main.py) or create_all under the migration lock
+    # (plain uvicorn); "fast" skips all schema work and expects `python -m src.db.migrate`
+    # to run once as a release step
+    STARTUP_MODE: str = "full"
+
+    # Production server (main.py)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 1  # worker processes, 0 = one per CPU core
+    SERVER_LOOP: str = "auto"  # "auto" picks uvloop when installed
+    SERVER_HTTP: str = "auto"  # "auto" picks httptools when installed
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = 30  # seconds in-flight requests and WebSockets get to finish
+    KEEPALIVE_TIMEOUT: int = 5
+    # Proxies (IPs or CIDRs, comma-separated) whose X-Forwarded-For is believed. The client
+    # IP is the right-most hop not in this list, so clients cannot spoof it; "*" trusts any
+    # sender and lets them pick their own IP
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Prometheus metrics on /metrics
+    METRICS_ENABLED: bool = True
+
+    # Query log: statements slower than this are logged with their route
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    # X-DB-Queries / X-DB-Time response headers, on by default outside production
+    QUERY_STATS_HEADERS: Optional[bool] = None
+
+    # Notification retention: read rows older than READ days and any row older than
+    # UNREAD days are pruned every PRUNE_INTERVAL seconds by one worker (0 disables
+    # the in-process job; `python -m src.notifications.retention` can run from cron)
+    NOTIFICATION_READ_RETENTION_DAYS: int = 30
+    NOTIFICATION_UNREAD_RETENTION_DAYS: int = 180
+    NOTIFICATION_PRUNE_INTERVAL_SECONDS: int = 3600
+    NOTIFICATION_PRUNE_BATCH_SIZE: int = 5000
+
+    # Push coalescing: after a push for a (user, event, type), further ones within the
+    # window are folded into one "N new messages" summary; each user gets at most
+    # PUSH_RATE_LIMIT_PER_MINUTE pushes
+    PUSH_COALESCE_WINDOW_SECONDS: int = 30
+    PUSH_RATE_LIMIT_PER_MINUTE: int = 6
+
+    # Event reminders go to attendees this long before start; the scheduler polls
+    # Redis every POLL seconds (0 disables it in this process)
+    EVENT_REMINDER_LEAD_MINUTES: int = 60
+    EVENT_REMINDER_POLL_SECONDS: int = 15
+
+    # Background jobs (src/jobs): "redis" queues them for workers, "inline" runs them
+    # in the caller. The web process also runs a worker unless JOB_WORKER_EMBEDDED
+    # is off, e.g. when a separate `python -m src.jobs.worker` process is deployed
+    JOB_BACKEND: str = "redis"
+    JOB_WORKER_EMBEDDED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 8
+    JOB_MAX_RETRIES: int = 5
+    JOB_RETRY_BACKOFF_SECONDS: float = 2.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 300
+
+    # Certificate rendering (src/users/certificate.py). Assets default to the
+    # Flutter app's copies; a missing asset falls back to a plain rendering
+    CERTIFICATE_ASSETS_DIR: str = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "frontend", "assets"
+    )
+    CERTIFICATE_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "volunsphere-certificates")
+    CERTIFICATE_RENDER_WORKERS: int = 2
+
+    # Rate limits: "METHOD /path/{param}" -> "<count>/<period>" token buckets, keyed
+    # per user when a valid bearer token is sent and per client IP otherwise.
+    # Override with JSON, e.g. RATE_LIMITS='{"POST /api/v1/auth/login": "5/minute"}'
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, str] = {
+        "POST /api/v1/auth/login": "10/minute",
+        "POST /api/v1/auth/signup": "5/minute",
+        "POST /api/v1/auth/forgot-password": "5/hour",
+        "POST /api/v1/auth/verify-otp": "10/minute",
+        "POST /api/v1/auth/reset-password": "5/minute",
+        "POST /api/v1/auth/upload-profile-image": "10/minute",
+        "POST /api/v1/events/upload-event-images/": "10/minute",
+        "POST /api/v1/chatbot/query": "20/minute",
+    }
+    # Messages a user may send per chat WebSocket
+    CHAT_MESSAGE_RATE_LIMIT: str = "20/10seconds"
+
+    # Chat presence: each worker refreshes its connections every HEARTBEAT seconds
+    # (0 disables it in this process); a connection not refreshed for TTL seconds is offline
+    CHAT_PRESENCE_TTL_SECONDS: int = 60
+    CHAT_PRESENCE_HEARTBEAT_SECONDS: int = 20
+
+    # Response compression (brotli when brotli-asgi is installed, gzip otherwise)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 5
+
     model_config = SettingsConfigDict(
         env_file = ".env",
         extra="ignore"
     )
 
+    @property
+    def query_stats_headers_enabled(self) -> bool:
+        if self.QUERY_STATS_HEADERS is not None:
+            return self.QUERY_STATS_HEADERS
+        return self.ENVIRONMENT != "production"
+
     @property
     def async_database_url(self) -> str:
         """Convert DATABASE_URL to use asyncpg driver"""
@@ -1,8 +1,11 @@
 from sqlmodel import create_engine, SQLModel
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from src.config import Config
+from src.metrics import instrument_pool
+from src.db.querylog import instrument_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 
 # Use create_async_engine for better async support
 async_engine = create_async_engine(
@@ -10,19 +13,36 @@ async_engine = create_async_engine(
     echo=True if Config.ENVIRONMENT == "development" else False,
     pool_pre_ping=True,  # Verify connections before use
     pool_recycle=300,    # Recycle connections every 5 minutes
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_timeout=Config.DB_POOL_TIMEOUT,
+)
+instrument_pool(async_engine)
+instrument_engine(async_engine, slow_query_ms=Config.SLOW_QUERY_THRESHOLD_MS)
+
+async_session_maker = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
 )
 
 
 async def init_db() -> None:
+    from src.db.migrate import MIGRATION_LOCK_ID
+
     async with async_engine.begin() as conn:
+        # Workers booting together take turns, on the same lock as src.db.migrate
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+        # Trigram indexes on posts/comments/users need the extension first
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
+async def check_db() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 async def get_session() -> AsyncSession:
-    async_session = sessionmaker(
-        bind=async_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
-    async with async_session() as session:
-        yield session
\ No newline at end of file
+    async with async_session_maker() as session:
+        yield session
@@ -0,0 +1,47 @@
+"""Run alembic migrations once per release.
+
+    cd backend && python -m src.db.migrate
+
+Replicas that start at the same time serialize on a Postgres advisory lock,
+so only the first one applies pending revisions and the rest find nothing to do.
+"""
+import os
+import sys
+import time
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from src.config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 72011420
+
+
+def run_migrations(revision: str = "head") -> None:
+    engine = create_engine(Config.sync_database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as lock_conn:
+            print("🔒 Waiting for migration lock...")
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+            try:
+                started = time.perf_counter()
+                alembic_cfg = AlembicConfig(os.path.join(BACKEND_DIR, "alembic.ini"))
+                command.upgrade(alembic_cfg, revision)
+                print(f"✅ Migrations completed in {time.perf_counter() - started:.2f}s")
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_ID})
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        run_migrations(sys.argv[1] if len(sys.argv) > 1 else "head")
+    except Exception as e:
+        print(f"❌ Migrations failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,91 @@
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger("volunsphere.db")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "scope")
+
+    def __init__(self, scope: dict):
+        self.count = 0
+        self.seconds = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "?")
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, IN-lists and whitespace so equal queries log identically."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PARAM_LIST.sub("$n, ...", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def instrument_engine(engine, slow_query_ms: int) -> None:
+    """Count statements and DB time per request and log statements slower than slow_query_ms."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        if elapsed * 1000 >= slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s",
+                elapsed * 1000,
+                stats.route if stats is not None else "-",
+                normalize_sql(statement),
+            )
+
+
+class QueryStatsMiddleware:
+    """Tracks queries per request; optionally reports them as X-DB-Queries / X-DB-Time (ms) headers."""
+
+    def __init__(self, app, add_headers: bool = False):
+        self.app = app
+        self.add_headers = add_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.add_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.count))
+                headers.append("X-DB-Time", f"{stats.seconds * 1000:.1f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
@@ -1,11 +1,30 @@
+import time
 import redis.asyncio as redis
 from src.config import Config
+from src.metrics import REDIS_LATENCY
 
 JTI_EXPIRY = 3600  
 OTP_EXPIRY = 300   
 
+class InstrumentedRedis(redis.Redis):
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_LATENCY.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+
+def _create_redis_client():
+    if Config.REDIS_URL.startswith("fakeredis://"):
+        # In-process stand-in used by the benchmark suite, see benchmarks/
+        from fakeredis import FakeAsyncRedis
+        return FakeAsyncRedis(decode_responses=True)
+    return InstrumentedRedis(**Config.redis_connection_params)
+
+
 # Redis client instance - use the connection params from config
-redis_client = redis.Redis(**Config.redis_connection_params)
+redis_client = _create_redis_client()
 
  
 
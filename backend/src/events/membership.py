@@ -0,0 +1,133 @@
+"""Cached event membership, used to authorize chat connections.
+
+Each event has a Redis set holding its creator and attendees plus a marker
+member that says the set is complete, so one SMISMEMBER answers both "is this
+user in?" and "can the answer be trusted?". create_event, join_event,
+leave_event and delete_event keep the set current; a set without the marker
+(expired, evicted, never built) is reloaded from Postgres.
+
+Only a positive answer is trusted outright. A reload can race a join and miss
+the new attendee, so a "not a member" answer is confirmed against Postgres
+before anyone is turned away. The creator is also tagged in the set, so
+leaving their own event's RSVP list does not drop them.
+"""
+from typing import Optional, Set, Tuple
+
+from sqlalchemy import exists, or_, select
+
+from src.db.main import async_session_maker
+from src.db.redis import redis_client
+from src.events.models import Event, EventResponse
+
+LOADED_MARKER = "*"
+CREATOR_PREFIX = "creator:"
+# Bounds how long a membership change that raced a reload can linger
+MEMBERS_EXPIRY = 3600
+
+# Add a member only to a complete set; a partial set would look authoritative
+_ADD_IF_LOADED = redis_client.register_script("""
+if redis.call('SISMEMBER', KEYS[1], ARGV[2]) == 1 then
+    return redis.call('SADD', KEYS[1], ARGV[1])
+end
+return 0
+""")
+
+# Remove a member unless they are the event's creator
+_REMOVE_UNLESS_CREATOR = redis_client.register_script("""
+if redis.call('SISMEMBER', KEYS[1], ARGV[2] .. ARGV[1]) == 1 then
+    return 0
+end
+return redis.call('SREM', KEYS[1], ARGV[1])
+""")
+
+
+def _members_key(event_id) -> str:
+    return f"events:members:{event_id}"
+
+
+async def _load_members(event_id) -> Optional[Tuple[str, Set[str]]]:
+    """Creator id and attendee ids from Postgres, or None if the event does not exist."""
+    async with async_session_maker() as session:
+        creator_id = (await session.execute(select(Event.creator_id).where(Event.id == event_id))).scalar()
+        if creator_id is None:
+            return None
+        attendees = await session.execute(select(EventResponse.user_id).where(EventResponse.event_id == event_id))
+        return str(creator_id), {str(user_id) for user_id in attendees.scalars()}
+
+
+async def _is_member_in_db(event_id, user_id) -> bool:
+    stmt = select(Event.id).where(
+        Event.id == event_id,
+        or_(
+            Event.creator_id == user_id,
+            exists().where(EventResponse.event_id == event_id, EventResponse.user_id == user_id),
+        ),
+    )
+    async with async_session_maker() as session:
+        return (await session.execute(stmt)).first() is not None
+
+
+async def _store_members(event_id, creator_id: str, members: Set[str]) -> None:
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(_members_key(event_id))
+        pipe.sadd(_members_key(event_id), LOADED_MARKER, CREATOR_PREFIX + creator_id, creator_id, *members)
+        pipe.expire(_members_key(event_id), MEMBERS_EXPIRY)
+        await pipe.execute()
+
+
+async def is_event_member(event_id, user_id) -> bool:
+    try:
+        is_member, loaded = await redis_client.smismember(_members_key(event_id), [str(user_id), LOADED_MARKER])
+        if is_member and loaded:
+            return True
+    except Exception as e:
+        print(f"⚠️ Membership cache read failed for event {event_id}: {e}")
+        loaded = False
+
+    if loaded:
+        # The set may have been rebuilt just before this user joined
+        if not await _is_member_in_db(event_id, user_id):
+            return False
+        await add_member(event_id, user_id)
+        return True
+
+    loaded_members = await _load_members(event_id)
+    if loaded_members is None:
+        return False
+    creator_id, members = loaded_members
+    try:
+        await _store_members(event_id, creator_id, members)
+    except Exception as e:
+        print(f"⚠️ Membership cache write failed for event {event_id}: {e}")
+    return str(user_id) == creator_id or str(user_id) in members
+
+
+async def cache_new_event(event_id, creator_id) -> None:
+    try:
+        await _store_members(event_id, str(creator_id), set())
+    except Exception as e:
+        print(f"⚠️ Membership cache write failed for event {event_id}: {e}")
+
+
+async def add_member(event_id, user_id) -> None:
+    try:
+        await _ADD_IF_LOADED(keys=[_members_key(event_id)], args=[str(user_id), LOADED_MARKER])
+    except Exception as e:
+        # Drop the set rather than leave it missing a member
+        print(f"⚠️ Membership cache update failed for event {event_id}: {e}")
+        await drop_event_members(event_id)
+
+
+async def remove_member(event_id, user_id) -> None:
+    try:
+        await _REMOVE_UNLESS_CREATOR(keys=[_members_key(event_id)], args=[str(user_id), CREATOR_PREFIX])
+    except Exception as e:
+        print(f"⚠️ Membership cache update failed for event {event_id}: {e}")
+        await drop_event_members(event_id)
+
+
+async def drop_event_members(event_id) -> None:
+    try:
+        await redis_client.delete(_members_key(event_id))
+    except Exception as e:
+        print(f"⚠️ Membership cache delete failed for event {event_id}: {e}")
@@ -1,7 +1,8 @@
 from sqlmodel import SQLModel, Field
 from sqlalchemy import Column
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
-from sqlalchemy import Float, Integer, UniqueConstraint, CheckConstraint
+from sqlalchemy import Float, Integer, UniqueConstraint, CheckConstraint, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime
 from typing import Optional
 import uuid
@@ -57,6 +58,25 @@ class Event(SQLModel, table=True):
         return f"<Event {self.title} - {self.start_datetime.isoformat()} to {self.end_datetime.isoformat()} ({self.duration_minutes} min)>"
 
 
+# Full-text document for /events/search, maintained by Postgres. It is added to the
+# table but not mapped, so ORM loads and inserts never touch it.
+Event.__table__.append_column(
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+    )
+)
+Index("ix_events_search_vector", Event.__table__.c.search_vector, postgresql_using="gin")
+Index("ix_events_start_datetime", Event.__table__.c.start_datetime)
+Index("ix_events_latitude_longitude", Event.__table__.c.latitude, Event.__table__.c.longitude)
+
+
 
 
 class EventResponse(SQLModel, table=True):
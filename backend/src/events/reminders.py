@@ -0,0 +1,216 @@
+"""Reminders sent to event attendees shortly before an event starts.
+
+Upcoming events live in a Redis sorted set scored by the time their reminder
+is due (start_datetime minus EVENT_REMINDER_LEAD_MINUTES), so nothing scans
+the events table. create_event/update_event (re)schedule an event and
+delete_event cancels it.
+
+Every replica runs the scheduler loop, but only the holder of a Redis lease
+polls. Due events are claimed with a Lua script that moves them to an
+in-flight set in one step. A per-start-time marker records the last attendee
+whose notification was committed, so a retry resumes after them and each
+event start is announced once. A claim stays in flight until its reminder has
+gone out; claims left there by a failed send or a replica that died are
+requeued after a grace period.
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.config import Config
+from src.db.main import async_session_maker
+from src.db.redis import redis_client
+from src.events.models import Event, EventResponse
+from src.notifications.push import enqueue_push
+from src.notifications.service import create_notifications, get_fcm_tokens
+from src.notifications.unread import increment_unread_counts
+
+SCHEDULE_KEY = "events:reminders"
+INFLIGHT_KEY = "events:reminders:inflight"
+LEADER_KEY = "events:reminders:leader"
+CLAIM_BATCH_SIZE = 100
+ATTENDEE_BATCH_SIZE = 1000
+# In-flight claims older than this belonged to a replica that went away
+INFLIGHT_GRACE_SECONDS = 300
+SENT_MARKER_EXPIRY = 2 * 24 * 3600
+SENT_DONE = "done"
+
+# Move up to ARGV[2] reminders due by ARGV[1] into the in-flight set, stamped with ARGV[1]
+_CLAIM_DUE = redis_client.register_script("""
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, event_id in ipairs(due) do
+    redis.call('ZREM', KEYS[1], event_id)
+    redis.call('ZADD', KEYS[2], ARGV[1], event_id)
+end
+return due
+""")
+
+# Put in-flight claims made before ARGV[1] back on the schedule as due now
+_REQUEUE_STALE = redis_client.register_script("""
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, event_id in ipairs(stale) do
+    redis.call('ZREM', KEYS[2], event_id)
+    redis.call('ZADD', KEYS[1], 'NX', ARGV[1], event_id)
+end
+return #stale
+""")
+
+_RENEW_LEASE = redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+""")
+
+
+def _lead() -> timedelta:
+    return timedelta(minutes=Config.EVENT_REMINDER_LEAD_MINUTES)
+
+
+def _sent_key(event_id, start: datetime) -> str:
+    return f"events:reminders:sent:{event_id}:{int(start.timestamp())}"
+
+
+async def schedule_reminder(event: Event) -> None:
+    """Index the event's reminder, or drop it if the reminder time has passed."""
+    due = event.start_datetime - _lead()
+    try:
+        if due > datetime.now(timezone.utc):
+            await redis_client.zadd(SCHEDULE_KEY, {str(event.id): due.timestamp()})
+        else:
+            await redis_client.zrem(SCHEDULE_KEY, str(event.id))
+    except Exception as e:
+        print(f"⚠️ Reminder scheduling failed for event {event.id}: {e}")
+
+
+async def cancel_reminder(event_id) -> None:
+    try:
+        await redis_client.zrem(SCHEDULE_KEY, str(event_id))
+    except Exception as e:
+        print(f"⚠️ Reminder cancel failed for event {event_id}: {e}")
+
+
+async def backfill_reminders() -> int:
+    """Index every event whose reminder is still ahead, e.g. after Redis lost its data."""
+    cutoff = datetime.now(timezone.utc) + _lead()
+    indexed = 0
+    async with async_session_maker() as session:
+        result = await session.stream(
+            select(Event.id, Event.start_datetime)
+            .where(Event.start_datetime > cutoff)
+            .execution_options(yield_per=1000)
+        )
+        async for rows in result.partitions():
+            await redis_client.zadd(
+                SCHEDULE_KEY,
+                {str(event_id): (start - _lead()).timestamp() for event_id, start in rows},
+            )
+            indexed += len(rows)
+    return indexed
+
+
+async def _attendee_batches(session, event_id: uuid.UUID, last: Optional[uuid.UUID] = None):
+    while True:
+        stmt = select(EventResponse.user_id).where(EventResponse.event_id == event_id)
+        if last is not None:
+            stmt = stmt.where(EventResponse.user_id > last)
+        result = await session.execute(stmt.order_by(EventResponse.user_id).limit(ATTENDEE_BATCH_SIZE))
+        batch = result.scalars().all()
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+
+
+async def send_reminder(event_id: str) -> int:
+    async with async_session_maker() as session:
+        event = await session.get(Event, uuid.UUID(event_id))
+        if not event:
+            return 0
+        due = event.start_datetime - _lead()
+        if due.timestamp() > time.time():
+            # Moved later after it was claimed; put it back
+            await schedule_reminder(event)
+            return 0
+        if event.start_datetime <= datetime.now(timezone.utc):
+            return 0
+        sent_key = _sent_key(event.id, event.start_datetime)
+        progress = await redis_client.get(sent_key)
+        if progress == SENT_DONE:
+            return 0
+
+        minutes = max(1, round((event.start_datetime - datetime.now(timezone.utc)).total_seconds() / 60))
+        body = f"{event.title} starts in {minutes} minutes"
+        notified = 0
+        async for user_ids in _attendee_batches(session, event.id, uuid.UUID(progress) if progress else None):
+            notifications = await create_notifications(
+                session,
+                user_ids,
+                message=body,
+                type="event_reminder",
+                event_id=str(event.id),
+                event_title=event.title,
+            )
+            tokens = await get_fcm_tokens(session, user_ids)
+            await session.commit()
+            # Only committed batches count as sent; a retry starts after this one
+            await redis_client.set(sent_key, str(user_ids[-1]), ex=SENT_MARKER_EXPIRY)
+            await increment_unread_counts(n.user_id for n in notifications)
+            if tokens:
+                await enqueue_push(
+                    list(tokens.values()),
+                    "Event Reminder",
+                    body,
+                    {"type": "event_reminder", "event_id": str(event.id)},
+                )
+            notified += len(user_ids)
+        await redis_client.set(sent_key, SENT_DONE, ex=SENT_MARKER_EXPIRY)
+        return notified
+
+
+async def _acquire_or_renew(token: str, lease_ms: int, leading: bool) -> bool:
+    if leading and await _RENEW_LEASE(keys=[LEADER_KEY], args=[token, lease_ms]):
+        return True
+    return bool(await redis_client.set(LEADER_KEY, token, nx=True, px=lease_ms))
+
+
+async def _poll_once() -> List[Tuple[str, int]]:
+    now = time.time()
+    await _REQUEUE_STALE(keys=[SCHEDULE_KEY, INFLIGHT_KEY], args=[now - INFLIGHT_GRACE_SECONDS])
+    sent = []
+    while True:
+        claimed = await _CLAIM_DUE(keys=[SCHEDULE_KEY, INFLIGHT_KEY], args=[now, CLAIM_BATCH_SIZE])
+        for event_id in claimed:
+            try:
+                sent.append((event_id, await send_reminder(event_id)))
+            except Exception as e:
+                # Left in flight, so the stale requeue retries it after the grace period
+                print(f"⚠️ Reminder for event {event_id} failed, will retry: {e}")
+                continue
+            await redis_client.zrem(INFLIGHT_KEY, event_id)
+        if len(claimed) < CLAIM_BATCH_SIZE:
+            return sent
+
+
+async def run_reminder_scheduler(poll_seconds: int) -> None:
+    token = uuid.uuid4().hex
+    lease_ms = poll_seconds * 3 * 1000
+    leading = False
+    while True:
+        try:
+            was_leading = leading
+            leading = await _acquire_or_renew(token, lease_ms, leading)
+            if leading and not was_leading:
+                print(f"⏰ Reminder scheduler leader, indexed {await backfill_reminders()} upcoming events")
+            if leading:
+                for event_id, notified in await _poll_once():
+                    print(f"⏰ Reminder for event {event_id} sent to {notified} attendees")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Reminder scheduler error: {e}")
+        await asyncio.sleep(poll_seconds)
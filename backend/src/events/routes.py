@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, status, File, UploadFile
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
-from typing import List
+from sqlalchemy import Float, and_, cast, func, or_
+from typing import List, Optional
+import math
 from datetime import datetime, timezone
 from uuid import UUID 
 import uuid
@@ -10,16 +12,37 @@ from src.db.main import get_session
 from src.auth.dependencies import AccessTokenBearer
 from src.events.models import Event,EventResponse
 from src.auth.models import User
-from src.events.schemas import EventCreate, EventRead, EventResponseUpdate, EventResponseRead
-from supabase import create_client
-from src.config import Config
+from src.events.schemas import EventCreate, EventRead, EventResponseUpdate, EventResponseRead, EventSearchPage
+from src.pagination import encode_cursor, decode_cursor, MAX_PAGE_SIZE
+from src.exports import ExportFormat, export_response
+from src.search import prefix_tsquery
+from src.clients import get_supabase
 from src.notifications.models import Notification
 from src.notifications.schemas import NotificationCreate
-from src.notifications.fcm import send_fcm_push
+from src.notifications.jobs import send_push
+from src.notifications.push import enqueue_push
+from src.notifications.service import create_notifications
+from src.notifications.unread import increment_unread_counts
+from src.events.reminders import schedule_reminder, cancel_reminder
+from src.events.membership import add_member, cache_new_event, drop_event_members, remove_member
 
 
 events_router = APIRouter()
 
+KM_PER_DEGREE = 111.32
+EARTH_RADIUS_KM = 6371.0
+MAX_SEARCH_RADIUS_KM = 500
+
+
+def haversine_km(lat: float, lng: float, lat_column, lng_column):
+    """Great-circle distance in SQL between a point and a pair of columns."""
+    dlat = func.radians(lat_column - lat) / 2
+    dlng = func.radians(lng_column - lng) / 2
+    a = func.power(func.sin(dlat), 2) + (
+        math.cos(math.radians(lat)) * func.cos(func.radians(lat_column)) * func.power(func.sin(dlng), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))
+
 @events_router.post("/create", response_model=EventRead)
 async def create_event(
     event: EventCreate,
@@ -49,30 +72,32 @@ async def create_event(
     session.add(db_event)
     await session.commit()
     await session.refresh(db_event)
+    await schedule_reminder(db_event)
+    await cache_new_event(db_event.id, user_id)
 
     # Notify all users except creator about new event
-    users_result = await session.exec(select(User).where(User.uid != user_id))
-    users = users_result.all()
-    for user in users:
-        if user.fcm_token:
-            notification = Notification(
-                user_id=user.uid,
-                event_id=str(db_event.id),
-                event_title=db_event.title,
-                message=f"New event created: {db_event.title}",
-                type="event_created"
-            )
-            session.add(notification)
-            try:
-                send_fcm_push(
-                    token=user.fcm_token,
-                    title="New Event Created",
-                    body=f"{db_event.title} is now available!",
-                    data={"type": "event_created", "event_id": str(db_event.id)}
-                )
-            except Exception as e:
-                print(f"FCM push failed: {e}")
+    users_result = await session.exec(
+        select(User.uid, User.fcm_token).where(User.uid != user_id, User.fcm_token.is_not(None))
+    )
+    recipients = users_result.all()
+    notified_ids = [uid for uid, _ in recipients]
+    await create_notifications(
+        session,
+        notified_ids,
+        message=f"New event created: {db_event.title}",
+        type="event_created",
+        event_id=str(db_event.id),
+        event_title=db_event.title,
+    )
     await session.commit()
+    await increment_unread_counts(notified_ids)
+    if recipients:
+        await enqueue_push(
+            [token for _, token in recipients],
+            "New Event Created",
+            f"{db_event.title} is now available!",
+            {"type": "event_created", "event_id": str(db_event.id)},
+        )
     return db_event
 
 @events_router.get("/my", response_model=List[EventRead])
@@ -97,6 +122,63 @@ async def get_all_events(session: AsyncSession = Depends(get_session)):
     events = result.all()
     return events
 
+@events_router.get("/search", response_model=EventSearchPage)
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    starts_after: Optional[datetime] = None,
+    starts_before: Optional[datetime] = None,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=MAX_SEARCH_RADIUS_KM),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    query = prefix_tsquery(q)
+    if query is None:
+        return {"items": [], "next_cursor": None}
+
+    search_vector = Event.__table__.c.search_vector
+    # float8 so the rank survives the cursor round-trip exactly
+    rank = cast(func.ts_rank(search_vector, query), Float).label("rank")
+    stmt = select(Event, rank).where(search_vector.op("@@")(query))
+
+    if starts_after:
+        stmt = stmt.where(Event.start_datetime >= starts_after)
+    if starts_before:
+        stmt = stmt.where(Event.start_datetime < starts_before)
+
+    geo = (lat, lng, radius_km)
+    if any(value is not None for value in geo):
+        if any(value is None for value in geo):
+            raise HTTPException(status_code=400, detail="lat, lng and radius_km must be given together")
+        # Bounding box first so the (latitude, longitude) index does the coarse cut
+        lat_delta = radius_km / KM_PER_DEGREE
+        lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        stmt = stmt.where(
+            Event.latitude.between(lat - lat_delta, lat + lat_delta),
+            Event.longitude.between(lng - lng_delta, lng + lng_delta),
+            haversine_km(lat, lng, Event.latitude, Event.longitude) <= radius_km,
+        )
+
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor, 2)
+        try:
+            last_rank, last_id = float(last_rank), UUID(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, Event.id > last_id)))
+
+    result = await session.exec(stmt.order_by(rank.desc(), Event.id).limit(limit + 1))
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_event, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, str(last_event.id))
+    return {"items": [event for event, _ in rows], "next_cursor": next_cursor}
+
+
 @events_router.get("/{event_id}", response_model=EventRead)
 async def get_event_by_id(event_id: UUID, session: AsyncSession = Depends(get_session)):
     event = await session.get(Event, event_id)
@@ -114,6 +196,8 @@ async def delete_event(event_id: UUID, token_data: dict = Depends(AccessTokenBea
         raise HTTPException(status_code=403, detail="Forbidden")
     await session.delete(event)
     await session.commit()
+    await cancel_reminder(event_id)
+    await drop_event_members(event_id)
     return {"message": "Event deleted"}
 
 from fastapi import Body
@@ -149,30 +233,31 @@ async def update_event(
     session.add(event)
     await session.commit()
     await session.refresh(event)
+    await schedule_reminder(event)
 
     # Notify all users except updater about event update
-    users_result = await session.exec(select(User).where(User.uid != user_id))
-    users = users_result.all()
-    for user in users:
-        if user.fcm_token:
-            notification = Notification(
-                user_id=user.uid,
-                event_id=str(event.id),
-                event_title=event.title,
-                message=f"Event updated: {event.title}",
-                type="event_updated"
-            )
-            session.add(notification)
-            try:
-                send_fcm_push(
-                    token=user.fcm_token,
-                    title="Event Updated",
-                    body=f"{event.title} has been updated!",
-                    data={"type": "event_updated", "event_id": str(event.id)}
-                )
-            except Exception as e:
-                print(f"FCM push failed: {e}")
+    users_result = await session.exec(
+        select(User.uid, User.fcm_token).where(User.uid != user_id, User.fcm_token.is_not(None))
+    )
+    recipients = users_result.all()
+    notified_ids = [uid for uid, _ in recipients]
+    await create_notifications(
+        session,
+        notified_ids,
+        message=f"Event updated: {event.title}",
+        type="event_updated",
+        event_id=str(event.id),
+        event_title=event.title,
+    )
     await session.commit()
+    await increment_unread_counts(notified_ids)
+    if recipients:
+        await enqueue_push(
+            [token for _, token in recipients],
+            "Event Updated",
+            f"{event.title} has been updated!",
+            {"type": "event_updated", "event_id": str(event.id)},
+        )
     return event
 
 
@@ -210,6 +295,7 @@ async def join_event(
     rsvp = EventResponse(event_id=event_id, user_id=user_id)
     session.add(rsvp)
     await session.commit()
+    await add_member(event_id, user_id)
     return {"message": "Joined event"}
 
 @events_router.post("/{event_id}/leave", status_code=200)
@@ -228,6 +314,7 @@ async def leave_event(
 
     await session.delete(rsvp)
     await session.commit()
+    await remove_member(event_id, user_id)
     return {"message": "Left event"}
 
 @events_router.get("/{event_id}/attendees/count", response_model=int)
@@ -240,6 +327,34 @@ async def get_attendees_count(
     count = len(result.all())
     return count
 
+ATTENDEE_EXPORT_COLUMNS = ["id", "username", "email", "first_name", "last_name", "phone", "rating", "work_time_hours"]
+
+
+@events_router.get("/{event_id}/attendees/export")
+async def export_attendees(
+    event_id: UUID,
+    format: ExportFormat = "csv",
+    token_data: dict = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    event = await session.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event.creator_id != UUID(token_data["sub"]):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    stmt = (
+        select(
+            User.uid, User.username, User.email, User.first_name, User.last_name, User.phone,
+            EventResponse.rating, EventResponse.work_time_hours,
+        )
+        .join(EventResponse, User.uid == EventResponse.user_id)
+        .where(EventResponse.event_id == event_id)
+        .order_by(User.username)
+    )
+    return export_response(stmt, ATTENDEE_EXPORT_COLUMNS, format, f"attendees-{event_id}")
+
+
 @events_router.get("/{event_id}/attendees")
 async def get_attendees(event_id: UUID, session: AsyncSession = Depends(get_session)):
      
@@ -266,13 +381,13 @@ async def get_attendees(event_id: UUID, session: AsyncSession = Depends(get_sess
 
 
 
-supabase = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
 @events_router.post("/upload-event-images/")
 async def upload_event_images(event_id: str, files: List[UploadFile] = File(...)):
     if len(files) > 3:
         raise HTTPException(status_code=400, detail="You can only upload up to 3 images.")
 
     urls = []
+    supabase = get_supabase()
 
     for file in files:
         file_ext = file.filename.split('.')[-1]
@@ -333,7 +448,10 @@ async def update_event_response(
         # Get event creator
         creator = await session.get(User, event.creator_id)
         user = await session.get(User, user_id)
+        notified_ids = []
+        pushes = []
         if creator and creator.fcm_token:
+            notified_ids.append(creator.uid)
             notification = Notification(
                 user_id=creator.uid,
                 event_id=str(event.id),
@@ -342,16 +460,13 @@ async def update_event_response(
                 type="event_response_updated"
             )
             session.add(notification)
-            try:
-                send_fcm_push(
-                    token=creator.fcm_token,
-                    title="Event Response Updated",
-                    body=f"A response was updated for your event: {event.title}",
-                    data={"type": "event_response_updated", "event_id": str(event.id)}
-                )
-            except Exception as e:
-                print(f"FCM push failed: {e}")
+            pushes.append((
+                creator.fcm_token,
+                "Event Response Updated",
+                f"A response was updated for your event: {event.title}",
+            ))
         if user and user.fcm_token:
+            notified_ids.append(user.uid)
             notification = Notification(
                 user_id=user.uid,
                 event_id=str(event.id),
@@ -360,16 +475,17 @@ async def update_event_response(
                 type="event_response_updated"
             )
             session.add(notification)
-            try:
-                send_fcm_push(
-                    token=user.fcm_token,
-                    title="Your Event Response Updated",
-                    body=f"Your response for '{event.title}' was updated.",
-                    data={"type": "event_response_updated", "event_id": str(event.id)}
-                )
-            except Exception as e:
-                print(f"FCM push failed: {e}")
+            pushes.append((
+                user.fcm_token,
+                "Your Event Response Updated",
+                f"Your response for '{event.title}' was updated.",
+            ))
         await session.commit()
+        await increment_unread_counts(notified_ids)
+        for token, title, body in pushes:
+            await send_push.enqueue(
+                [token], title, body, {"type": "event_response_updated", "event_id": str(event.id)}
+            )
     return {"message": "Response updated successfully"}
 
 
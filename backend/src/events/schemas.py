@@ -32,6 +32,11 @@ class EventRead(BaseModel):
         from_attributes = True
 
 
+class EventSearchPage(BaseModel):
+    items: List[EventRead]
+    next_cursor: Optional[str] = None
+
+
 class EventResponseUpdate(BaseModel):
     work_time_hours: Optional[float] = Field(default=None, ge=0)
     rating: Optional[int] = Field(default=None, ge=0, le=5)
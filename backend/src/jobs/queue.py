@@ -0,0 +1,212 @@
+"""A small job queue for work that should not run in the request path.
+
+Jobs are plain functions (sync or async) registered with @job and enqueued
+with JSON-serialisable arguments:
+
+    @job("notifications.send_push")
+    def send_push(tokens, title, body, data=None): ...
+
+    await send_push.enqueue(tokens, "Title", "Body")
+    await send_push.enqueue_in(30, tokens, "Title", "Body")  # run in 30 seconds
+
+JOB_BACKEND selects where they run:
+
+- "redis": jobs go on a Redis list and are run by `python -m src.jobs.worker`
+  or by the worker embedded in the web process (JOB_WORKER_EMBEDDED). Failed
+  jobs are retried with exponential backoff and dead-lettered after
+  JOB_MAX_RETRIES.
+- "inline": enqueue runs the job right away in the caller, with the same
+  retry and dead-letter rules but no backoff. Delayed jobs wait in an asyncio
+  task and do not survive a restart. Meant for tests and scripts.
+"""
+import asyncio
+import inspect
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from src.config import Config
+from src.db.redis import redis_client
+
+QUEUE_KEY = "jobs:queue"
+DELAYED_KEY = "jobs:delayed"
+INFLIGHT_KEY = "jobs:inflight"
+DEAD_KEY = "jobs:dead"
+DEAD_LETTER_LIMIT = 10000
+
+
+@dataclass
+class JobSpec:
+    name: str
+    func: Callable
+    max_retries: int
+    is_async: bool
+
+
+JOBS: Dict[str, JobSpec] = {}
+
+
+def job(name: str, max_retries: Optional[int] = None):
+    def decorator(func: Callable) -> Callable:
+        if name in JOBS:
+            raise ValueError(f"Job {name!r} is already registered")
+        JOBS[name] = JobSpec(
+            name=name,
+            func=func,
+            max_retries=Config.JOB_MAX_RETRIES if max_retries is None else max_retries,
+            is_async=inspect.iscoroutinefunction(func),
+        )
+
+        async def enqueue_job(*args, **kwargs) -> str:
+            return await enqueue(name, *args, **kwargs)
+
+        async def enqueue_job_in(delay: float, *args, **kwargs) -> str:
+            return await enqueue_in(delay, name, *args, **kwargs)
+
+        func.enqueue = enqueue_job
+        func.enqueue_in = enqueue_job_in
+        return func
+    return decorator
+
+
+async def run_job(spec: JobSpec, args: list, kwargs: dict) -> Any:
+    if spec.is_async:
+        return await spec.func(*args, **kwargs)
+    return await run_in_threadpool(spec.func, *args, **kwargs)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter; `attempt` starts at 1."""
+    delay = Config.JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+    return delay + random.uniform(0, delay / 2)
+
+
+# Move due retries and expired claims back onto the queue, then claim one job
+_DEQUEUE = redis_client.register_script("""
+local now = tonumber(ARGV[1])
+for _, key in ipairs({KEYS[2], KEYS[3]}) do
+    local due = redis.call('ZRANGEBYSCORE', key, '-inf', now, 'LIMIT', 0, 100)
+    for _, payload in ipairs(due) do
+        redis.call('ZREM', key, payload)
+        redis.call('LPUSH', KEYS[1], payload)
+    end
+end
+local payload = redis.call('RPOP', KEYS[1])
+if payload then
+    redis.call('ZADD', KEYS[3], now + tonumber(ARGV[2]), payload)
+end
+return payload
+""")
+
+
+class RedisBackend:
+    async def enqueue(self, payload: dict, delay: float = 0) -> None:
+        try:
+            if delay > 0:
+                # Promoted to the queue by the first claim after it is due
+                await redis_client.zadd(DELAYED_KEY, {json.dumps(payload): time.time() + delay})
+            else:
+                await redis_client.lpush(QUEUE_KEY, json.dumps(payload))
+        except Exception as e:
+            # Better late than lost: without Redis the caller runs the job itself
+            print(f"⚠️ Job queue unavailable, running {payload['name']} inline: {e}")
+            await _fallback.enqueue(payload, delay)
+
+    async def claim(self) -> Optional[str]:
+        return await _DEQUEUE(
+            keys=[QUEUE_KEY, DELAYED_KEY, INFLIGHT_KEY],
+            args=[time.time(), Config.JOB_VISIBILITY_TIMEOUT_SECONDS],
+        )
+
+    async def ack(self, raw: str) -> None:
+        await redis_client.zrem(INFLIGHT_KEY, raw)
+
+    async def retry(self, raw: str, payload: dict, delay: float) -> None:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zrem(INFLIGHT_KEY, raw)
+            pipe.zadd(DELAYED_KEY, {json.dumps(payload): time.time() + delay})
+            await pipe.execute()
+
+    async def dead_letter(self, raw: str, payload: dict) -> None:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zrem(INFLIGHT_KEY, raw)
+            pipe.lpush(DEAD_KEY, json.dumps(payload))
+            pipe.ltrim(DEAD_KEY, 0, DEAD_LETTER_LIMIT - 1)
+            await pipe.execute()
+
+
+class InlineBackend:
+    def __init__(self):
+        self.dead_letters: List[dict] = []
+        self._delayed = set()
+
+    async def enqueue(self, payload: dict, delay: float = 0) -> None:
+        if delay > 0:
+            task = asyncio.create_task(self._enqueue_later(payload, delay))
+            self._delayed.add(task)
+            task.add_done_callback(self._delayed.discard)
+            return
+        # Round-trip through JSON so inline runs see the same arguments a worker would
+        payload = json.loads(json.dumps(payload))
+        spec = JOBS[payload["name"]]
+        while True:
+            try:
+                await run_job(spec, payload["args"], payload["kwargs"])
+                return
+            except Exception as e:
+                payload["attempts"] += 1
+                payload["error"] = repr(e)
+                if payload["attempts"] > spec.max_retries:
+                    print(f"💀 Job {payload['name']} failed permanently: {e}")
+                    self.dead_letters.append(payload)
+                    return
+
+    async def _enqueue_later(self, payload: dict, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.enqueue(payload)
+
+
+_backends = {"redis": RedisBackend, "inline": InlineBackend}
+_backend = None
+# Where RedisBackend runs jobs while Redis is down
+_fallback = InlineBackend()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if Config.JOB_BACKEND not in _backends:
+            raise ValueError(f"Unknown JOB_BACKEND {Config.JOB_BACKEND!r}")
+        _backend = _backends[Config.JOB_BACKEND]()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Swap the backend, e.g. `set_backend(InlineBackend())` in tests."""
+    global _backend
+    _backend = backend
+
+
+async def enqueue(name: str, *args, **kwargs) -> str:
+    return await enqueue_in(0, name, *args, **kwargs)
+
+
+async def enqueue_in(delay: float, name: str, *args, **kwargs) -> str:
+    """Enqueue job `name` to run `delay` seconds from now."""
+    if name not in JOBS:
+        raise ValueError(f"Unknown job {name!r}")
+    job_id = uuid.uuid4().hex
+    await get_backend().enqueue({
+        "id": job_id,
+        "name": name,
+        "args": list(args),
+        "kwargs": kwargs,
+        "attempts": 0,
+        "enqueued_at": time.time(),
+    }, delay)
+    return job_id
@@ -0,0 +1,90 @@
+"""Run queued jobs.
+
+    cd backend && python -m src.jobs.worker [--concurrency 8]
+
+Any number of workers (and web processes with JOB_WORKER_EMBEDDED) can consume
+the same queue. A job claimed by a worker that dies is picked up again once
+JOB_VISIBILITY_TIMEOUT_SECONDS has passed, so jobs should be safe to re-run.
+"""
+import argparse
+import asyncio
+import json
+import signal
+import time
+
+from src.config import Config
+from src.jobs.queue import JOBS, RedisBackend, retry_delay, run_job
+
+IDLE_POLL_SECONDS = 0.5
+
+
+class Worker:
+    def __init__(self, concurrency: int = None):
+        self.concurrency = concurrency or Config.JOB_WORKER_CONCURRENCY
+        self.backend = RedisBackend()
+        self._stopping = False
+
+    async def _handle(self, raw: str) -> None:
+        payload = json.loads(raw)
+        spec = JOBS.get(payload["name"])
+        if spec is None:
+            print(f"💀 Unknown job {payload['name']}, dead-lettering")
+            payload["error"] = "unknown job"
+            await self.backend.dead_letter(raw, payload)
+            return
+
+        started = time.perf_counter()
+        try:
+            await run_job(spec, payload["args"], payload["kwargs"])
+        except Exception as e:
+            payload["attempts"] += 1
+            payload["error"] = repr(e)
+            if payload["attempts"] > spec.max_retries:
+                print(f"💀 Job {spec.name} ({payload['id']}) failed permanently: {e}")
+                await self.backend.dead_letter(raw, payload)
+            else:
+                delay = retry_delay(payload["attempts"])
+                print(f"⚠️ Job {spec.name} ({payload['id']}) failed, retry {payload['attempts']} in {delay:.1f}s: {e}")
+                await self.backend.retry(raw, payload, delay)
+            return
+        await self.backend.ack(raw)
+        print(f"✅ Job {spec.name} ({payload['id']}) done in {time.perf_counter() - started:.2f}s")
+
+    async def _consume(self) -> None:
+        while not self._stopping:
+            try:
+                raw = await self.backend.claim()
+            except Exception as e:
+                print(f"⚠️ Job queue unavailable: {e}")
+                await asyncio.sleep(IDLE_POLL_SECONDS * 10)
+                continue
+            if raw is None:
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+            await self._handle(raw)
+
+    async def run(self) -> None:
+        print(f"👷 Job worker started ({self.concurrency} slots, {len(JOBS)} job types)")
+        await asyncio.gather(*(self._consume() for _ in range(self.concurrency)))
+
+    def stop(self) -> None:
+        """Finish the jobs in hand and stop claiming new ones."""
+        self._stopping = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    # Running as src.jobs.worker imports the src package, i.e. the app and every
+    # job module next to the routes, so JOBS is complete by now
+    async def main():
+        worker = Worker(args.concurrency)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+        print("👋 Job worker stopped")
+
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Gauges are summed over live workers when PROMETHEUS_MULTIPROC_DIR is set (see main.py)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_COUNT = Counter("http_requests_total", "HTTP responses by route and status", ["method", "route", "status"])
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured SQLAlchemy pool size", multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Pooled connections in use", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections opened beyond the pool size", multiprocess_mode="livesum")
+
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds", "Redis command latency", ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+WS_CONNECTIONS = Gauge("websocket_connections", "Open WebSocket connections", ["channel"], multiprocess_mode="livesum")
+WS_ROOMS = Gauge("websocket_rooms", "Rooms with at least one open WebSocket", ["channel"], multiprocess_mode="livesum")
+
+FCM_SENT = Counter("fcm_messages_sent_total", "FCM push messages sent")
+FCM_FAILED = Counter("fcm_messages_failed_total", "FCM push messages that failed")
+PUSH_COALESCED = Counter("push_coalesced_total", "Pushes held back and folded into a summary push")
+
+LLM_LATENCY = Histogram(
+    "chatbot_llm_request_duration_seconds", "Chatbot LLM completion latency", ["outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+
+
+class PrometheusMiddleware:
+    """Records latency, status counts and in-flight requests per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            # Label by route template (/events/{event_id}) to keep cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(method, route_path).observe(time.perf_counter() - started)
+            REQUEST_COUNT.labels(method, route_path, str(status_code)).inc()
+
+
+def instrument_pool(engine) -> None:
+    """Track pool usage of an AsyncEngine through SQLAlchemy pool events."""
+    from sqlalchemy import event
+
+    pool = engine.pool
+    DB_POOL_SIZE.set(pool.size())
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+def render_metrics():
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
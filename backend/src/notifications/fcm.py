@@ -1,18 +1,16 @@
-import firebase_admin
-from firebase_admin import credentials, messaging
-import os
-import json
+from typing import List
 
-# Load Firebase credentials from environment variable
-firebase_json = os.getenv("FIREBASE_CREDENTIALS_JSON")
-cred_dict = json.loads(firebase_json)
+from src.clients import get_fcm
+from src.metrics import FCM_SENT, FCM_FAILED
+
+# FCM accepts at most 500 tokens per multicast request
+MULTICAST_BATCH_SIZE = 500
 
-# Initialize Firebase if not already initialized
-if not firebase_admin._apps:
-    cred = credentials.Certificate(cred_dict)
-    firebase_admin.initialize_app(cred)
 
 def send_fcm_push(token: str, title: str, body: str, data: dict = None):
+    # firebase_admin pulls in the google API client stack, so import it on first send
+    from firebase_admin import messaging
+
     message = messaging.Message(
         notification=messaging.Notification(
             title=title,
@@ -21,5 +19,38 @@ def send_fcm_push(token: str, title: str, body: str, data: dict = None):
         token=token,
         data=data or {},
     )
-    response = messaging.send(message)
+    try:
+        response = get_fcm().send(message)
+    except Exception:
+        FCM_FAILED.inc()
+        raise
+    FCM_SENT.inc()
     return response
+
+
+def send_fcm_multicast(tokens: List[str], title: str, body: str, data: dict = None) -> int:
+    """Send the same push to many devices in batches; returns how many were delivered.
+
+    Transport errors propagate so the calling job is retried. Callers enqueue
+    one job per MULTICAST_BATCH_SIZE tokens (see push.enqueue_push), so a retry
+    never resends a batch that already went out.
+    """
+    from firebase_admin import messaging
+
+    delivered = 0
+    for start in range(0, len(tokens), MULTICAST_BATCH_SIZE):
+        batch = tokens[start:start + MULTICAST_BATCH_SIZE]
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(title=title, body=body),
+            tokens=batch,
+            data=data or {},
+        )
+        try:
+            response = get_fcm().send_each_for_multicast(message)
+        except Exception:
+            FCM_FAILED.inc(len(batch))
+            raise
+        FCM_SENT.inc(response.success_count)
+        FCM_FAILED.inc(response.failure_count)
+        delivered += response.success_count
+    return delivered
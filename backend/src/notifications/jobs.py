@@ -0,0 +1,20 @@
+from typing import Dict, List
+
+from src.jobs.queue import job
+from src.notifications.fcm import send_fcm_multicast
+from src.notifications.push import flush_coalesced_push, send_coalesced_push
+
+
+@job("notifications.send_push")
+def send_push(tokens: List[str], title: str, body: str, data: dict = None) -> int:
+    return send_fcm_multicast(tokens, title, body, data)
+
+
+@job("notifications.send_coalesced_push")
+async def send_coalesced(tokens: Dict[str, str], topic: str, title: str, body: str, summary: str, data: dict = None) -> None:
+    await send_coalesced_push(tokens, topic, title, body, summary, data)
+
+
+@job("notifications.flush_coalesced_push")
+async def flush_coalesced(tokens: Dict[str, str], topic: str, title: str, summary: str, data: dict = None) -> None:
+    await flush_coalesced_push(tokens, topic, title, summary, data)
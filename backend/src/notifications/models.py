@@ -1,11 +1,26 @@
 from sqlmodel import SQLModel, Field, Column
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
-from sqlalchemy import Boolean
+from sqlalchemy import Boolean, Index, Integer, text
 from datetime import datetime
 import uuid
 
+CHAT_MESSAGE_UNREAD = "type = 'chat_message' AND NOT is_read"
+
 class Notification(SQLModel, table=True):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Inbox queries filter by user and read state, newest first
+        Index("ix_notifications_user_id_is_read_timestamp", "user_id", "is_read", "timestamp"),
+        # Retention pruning walks the table by age
+        Index("ix_notifications_timestamp", "timestamp"),
+        # At most one unread chat_message row per (user, event); new messages roll into it
+        Index(
+            "uq_notifications_unread_chat_message",
+            "user_id", "event_id",
+            unique=True,
+            postgresql_where=text(CHAT_MESSAGE_UNREAD),
+        ),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -18,3 +33,5 @@ class Notification(SQLModel, table=True):
     timestamp: datetime = Field(default_factory=datetime.now, sa_column=Column(TIMESTAMP(timezone=True), nullable=False))
     is_read: bool = Field(default=False, sa_column=Column(Boolean, nullable=False))
     type: str = Field(default="new_message")
+    # Number of events collapsed into this row (chat messages roll up per event)
+    count: int = Field(default=1, sa_column=Column(Integer, nullable=False, server_default="1"))
@@ -0,0 +1,150 @@
+"""Push coalescing and per-user rate limiting.
+
+The first push for a (user, event, type) goes out immediately. Pushes that
+follow within PUSH_COALESCE_WINDOW_SECONDS are only counted in Redis; when the
+window closes the user gets one summary ("5 new messages in X") and, if the
+room is still busy, a new window starts. Every push, leading or summary, also
+counts against the user's PUSH_RATE_LIMIT_PER_MINUTE; a summary that is over
+the limit waits for the next window instead of being dropped.
+
+Window flushes are delayed jobs on the job queue, so a summary survives a
+restart, and the pushes themselves are send_push jobs with their own retries.
+"""
+from collections import defaultdict
+from typing import Dict, List
+from uuid import UUID
+
+from src.config import Config
+from src.db.redis import redis_client
+from src.jobs.queue import enqueue, enqueue_in
+from src.metrics import PUSH_COALESCED
+from src.notifications.fcm import MULTICAST_BATCH_SIZE
+
+RATE_WINDOW_SECONDS = 60
+
+# Returns 0 when the push should go out now, otherwise the number of pushes pending
+# in the window (1 means the caller has to schedule the flush)
+_ADMIT = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    local pending = redis.call('INCR', KEYS[1])
+    if pending == 1 then
+        redis.call('EXPIRE', KEYS[1], ARGV[1] * 2)
+    end
+    return pending
+end
+local sent = redis.call('INCR', KEYS[2])
+if sent == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+if sent > tonumber(ARGV[2]) then
+    redis.call('SET', KEYS[1], 1, 'EX', ARGV[1] * 2)
+    return 1
+end
+redis.call('SET', KEYS[1], 0, 'EX', ARGV[1])
+return 0
+""")
+
+# Returns the number of pushes to summarize, 0 when nothing is pending, or -1 when
+# the user is over the rate limit and the flush has to be retried
+_FLUSH = redis_client.register_script("""
+local pending = tonumber(redis.call('GET', KEYS[1]) or '0')
+if pending == 0 then
+    return 0
+end
+local sent = redis.call('INCR', KEYS[2])
+if sent == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+if sent > tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[1] * 2)
+    return -1
+end
+redis.call('SET', KEYS[1], 0, 'EX', ARGV[1])
+return pending
+""")
+
+
+def _window_key(user_id: UUID, topic: str) -> str:
+    return f"push:window:{user_id}:{topic}"
+
+
+def _rate_key(user_id: UUID) -> str:
+    return f"push:rate:{user_id}"
+
+
+def _script_args() -> list:
+    return [Config.PUSH_COALESCE_WINDOW_SECONDS, Config.PUSH_RATE_LIMIT_PER_MINUTE, RATE_WINDOW_SECONDS]
+
+
+async def _run(script, tokens: Dict[UUID, str], topic: str) -> Dict[UUID, int]:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for user_id in tokens:
+            await script(keys=[_window_key(user_id, topic), _rate_key(user_id)], args=_script_args(), client=pipe)
+        results = await pipe.execute()
+    return dict(zip(tokens, results))
+
+
+async def enqueue_push(tokens: List[str], title: str, body: str, data: dict = None) -> None:
+    """Queue a push to `tokens` as one send_push job per FCM multicast batch."""
+    for start in range(0, len(tokens), MULTICAST_BATCH_SIZE):
+        await enqueue("notifications.send_push", tokens[start:start + MULTICAST_BATCH_SIZE], title, body, data)
+
+
+async def send_coalesced_push(
+    tokens: Dict[UUID, str],
+    topic: str,
+    title: str,
+    body: str,
+    summary: str,
+    data: dict = None,
+) -> None:
+    """Push `title`/`body` to each user's device, coalescing per (user, topic).
+
+    `topic` identifies the stream being coalesced, e.g. "<event_id>:chat_message".
+    `summary` is the body of the summary push and may use "{count}".
+    """
+    if not tokens:
+        return
+    try:
+        decisions = await _run(_ADMIT, tokens, topic)
+    except Exception as e:
+        # Coalescing is best effort; without Redis every push goes out
+        print(f"⚠️ Push coalescing unavailable: {e}")
+        await enqueue_push(list(tokens.values()), title, body, data)
+        return
+
+    leading = [tokens[user_id] for user_id, pending in decisions.items() if pending == 0]
+    if leading:
+        await enqueue_push(leading, title, body, data)
+    PUSH_COALESCED.inc(len(tokens) - len(leading))
+
+    opened = {str(user_id): tokens[user_id] for user_id, pending in decisions.items() if pending == 1}
+    if opened:
+        await _schedule_flush(opened, topic, title, summary, data)
+
+
+async def _schedule_flush(tokens: Dict[str, str], topic: str, title: str, summary: str, data: dict) -> None:
+    await enqueue_in(
+        Config.PUSH_COALESCE_WINDOW_SECONDS,
+        "notifications.flush_coalesced_push",
+        tokens, topic, title, summary, data,
+    )
+
+
+async def flush_coalesced_push(tokens: Dict[str, str], topic: str, title: str, summary: str, data: dict = None) -> None:
+    """Close the users' windows and send one summary push per user with pending pushes."""
+    # A Redis error here fails the job before any window is touched, so the retry is safe
+    counts = await _run(_FLUSH, tokens, topic)
+
+    # Users with the same count share one multicast
+    by_count: Dict[int, List[str]] = defaultdict(list)
+    for user_id, count in counts.items():
+        if count > 0:
+            by_count[count].append(tokens[user_id])
+    for count, batch in by_count.items():
+        await enqueue_push(batch, title, summary.replace("{count}", str(count)), data)
+
+    # Over the rate limit: try again when the next window closes
+    limited = {user_id: tokens[user_id] for user_id, count in counts.items() if count < 0}
+    if limited:
+        await _schedule_flush(limited, topic, title, summary, data)
@@ -0,0 +1,95 @@
+"""Prune old notifications so the table stays bounded.
+
+    cd backend && python -m src.notifications.retention [--read-days 30] [--unread-days 180]
+
+Read notifications older than NOTIFICATION_READ_RETENTION_DAYS and any
+notification older than NOTIFICATION_UNREAD_RETENTION_DAYS are deleted in
+small batches, so the job never holds long locks on the inbox. The app also
+runs it every NOTIFICATION_PRUNE_INTERVAL_SECONDS; a Redis lock makes sure
+only one worker does so per interval.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+from sqlalchemy import and_, delete, or_, select
+
+from src.config import Config
+from src.db.main import async_session_maker
+from src.db.redis import redis_client
+from src.notifications.models import Notification
+from src.notifications.unread import adjust_unread_counts
+
+PRUNE_LOCK_KEY = "notifications:retention:lock"
+
+
+async def prune_notifications(
+    read_days: int = None,
+    unread_days: int = None,
+    batch_size: int = None,
+) -> int:
+    read_days = Config.NOTIFICATION_READ_RETENTION_DAYS if read_days is None else read_days
+    unread_days = Config.NOTIFICATION_UNREAD_RETENTION_DAYS if unread_days is None else unread_days
+    batch_size = batch_size or Config.NOTIFICATION_PRUNE_BATCH_SIZE
+
+    now = datetime.now(timezone.utc)
+    expired = or_(
+        and_(Notification.is_read == True, Notification.timestamp < now - timedelta(days=read_days)),
+        Notification.timestamp < now - timedelta(days=unread_days),
+    )
+    deleted = 0
+    while True:
+        async with async_session_maker() as session:
+            batch = select(Notification.id).where(expired).limit(batch_size).scalar_subquery()
+            result = await session.execute(
+                delete(Notification)
+                .where(Notification.id.in_(batch))
+                .returning(Notification.user_id, Notification.is_read),
+                execution_options={"synchronize_session": False},
+            )
+            rows = result.all()
+            await session.commit()
+
+        # Expired unread rows still count towards cached unread totals
+        deltas: Dict[uuid.UUID, int] = {}
+        for user_id, is_read in rows:
+            if not is_read:
+                deltas[user_id] = deltas.get(user_id, 0) - 1
+        await adjust_unread_counts(deltas)
+
+        deleted += len(rows)
+        if len(rows) < batch_size:
+            return deleted
+
+
+async def run_retention_loop(interval: int) -> None:
+    """Prune once per interval in whichever worker takes the lock first."""
+    while True:
+        try:
+            if await redis_client.set(PRUNE_LOCK_KEY, "1", nx=True, ex=interval):
+                started = time.perf_counter()
+                deleted = await prune_notifications()
+                print(f"🧹 Pruned {deleted} notifications in {time.perf_counter() - started:.2f}s")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Notification pruning failed: {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--read-days", type=int, default=None)
+    parser.add_argument("--unread-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        deleted = asyncio.run(prune_notifications(args.read_days, args.unread_days, args.batch_size))
+        print(f"✅ Pruned {deleted} notifications")
+    except Exception as e:
+        print(f"❌ Notification pruning failed: {e}")
+        sys.exit(1)
@@ -1,53 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import tuple_, update
+from typing import Optional
 from src.db.main import get_session
 from src.notifications.models import Notification
-from src.notifications.schemas import NotificationCreate, NotificationRead
-from src.auth.models import User
+from src.notifications.schemas import NotificationCreate, NotificationRead, NotificationPage, UnreadCount, MarkReadResult
+from src.notifications.unread import adjust_unread_counts, increment_unread_counts, get_unread_count
+from src.pagination import encode_cursor, decode_cursor, MAX_PAGE_SIZE
 from uuid import UUID
 from datetime import datetime
-from src.notifications.fcm import send_fcm_push
+from src.notifications.push import enqueue_push
+from src.notifications.service import create_notifications, get_fcm_tokens
 
 notification_router = APIRouter()
 
 @notification_router.post("/", response_model=list[NotificationRead])
-async def create_notification(notification: NotificationCreate, session: AsyncSession = Depends(get_session)):
+async def create_notification(
+    notification: NotificationCreate,
+    session: AsyncSession = Depends(get_session),
+):
     # Validate event_id for event-related notifications
     event_related_types = {"event_created", "event_updated", "event_message", "event_response_updated"}
     if notification.type in event_related_types and (not notification.event_id or str(notification.event_id).strip() == ""):
         raise HTTPException(status_code=400, detail="event_id is required for event-related notifications")
 
-    created_notifications = []
-    for user_id in notification.user_ids:
-        db_notification = Notification(
-            user_id=user_id,
-            event_id=notification.event_id,
-            event_title=notification.event_title,
-            message=notification.message,
-            type=notification.type,
-            timestamp=datetime.now(),
-            is_read=False
-        )
-        session.add(db_notification)
-        await session.commit()
-        await session.refresh(db_notification)
-        created_notifications.append(db_notification)
-
-        # Send FCM push notification
-        user_result = await session.execute(select(User).where(User.uid == user_id))
-        user = user_result.scalar_one_or_none()
-        if user and user.fcm_token:
-            try:
-                send_fcm_push(
-                    token=user.fcm_token,
-                    title=notification.event_title or "Volunsphere Notification",
-                    body=notification.message,
-                    data={"type": notification.type, "event_id": notification.event_id or ""}
-                )
-            except Exception as e:
-                print(f"FCM push failed: {e}")
+    created_notifications = await create_notifications(
+        session,
+        notification.user_ids,
+        message=notification.message,
+        type=notification.type,
+        event_id=notification.event_id,
+        event_title=notification.event_title,
+    )
+    tokens = await get_fcm_tokens(session, notification.user_ids)
+    await session.commit()
+
+    # Rolled-up chat rows (count > 1) were already unread
+    await increment_unread_counts(n.user_id for n in created_notifications if n.count == 1)
 
+    # Pushes go out from the job worker, batched per FCM multicast request
+    if tokens:
+        await enqueue_push(
+            list(tokens.values()),
+            title=notification.event_title or "Volunsphere Notification",
+            body=notification.message,
+            data={"type": notification.type, "event_id": notification.event_id or ""},
+        )
     return created_notifications
 
 @notification_router.get("/{user_id}", response_model=list[NotificationRead])
@@ -60,12 +59,75 @@ async def get_notifications(user_id: UUID, session: AsyncSession = Depends(get_s
     notifications = result.scalars().all()
     return notifications
 
+def _cursor_position(cursor: str):
+    timestamp, notification_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(timestamp), UUID(notification_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _notification_cursor(notification: Notification) -> str:
+    return encode_cursor(notification.timestamp.isoformat(), str(notification.id))
+
+
+@notification_router.get("/{user_id}/inbox", response_model=NotificationPage)
+async def get_inbox(
+    user_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    unread_only: bool = False,
+    session: AsyncSession = Depends(get_session),
+):
+    stmt = select(Notification).where(Notification.user_id == user_id)
+    if unread_only:
+        stmt = stmt.where(Notification.is_read == False)
+    if cursor:
+        stmt = stmt.where(tuple_(Notification.timestamp, Notification.id) < tuple_(*_cursor_position(cursor)))
+    stmt = stmt.order_by(Notification.timestamp.desc(), Notification.id.desc()).limit(limit + 1)
+
+    result = await session.execute(stmt)
+    notifications = result.scalars().all()
+    has_more = len(notifications) > limit
+    notifications = notifications[:limit]
+
+    return {
+        "items": notifications,
+        # Pass head_cursor to /read-all to clear exactly what the user has seen
+        "head_cursor": _notification_cursor(notifications[0]) if notifications else None,
+        "next_cursor": _notification_cursor(notifications[-1]) if has_more else None,
+    }
+
+@notification_router.get("/{user_id}/unread-count", response_model=UnreadCount)
+async def unread_count(user_id: UUID, session: AsyncSession = Depends(get_session)):
+    return {"user_id": user_id, "unread": await get_unread_count(user_id, session)}
+
+@notification_router.post("/{user_id}/read-all", response_model=MarkReadResult)
+async def mark_all_as_read(
+    user_id: UUID,
+    up_to: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    stmt = update(Notification).where(
+        Notification.user_id == user_id,
+        Notification.is_read == False,
+    )
+    if up_to:
+        stmt = stmt.where(tuple_(Notification.timestamp, Notification.id) <= tuple_(*_cursor_position(up_to)))
+    result = await session.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+    await session.commit()
+
+    await adjust_unread_counts({user_id: -result.rowcount})
+    return {"updated": result.rowcount}
+
 @notification_router.post("/{notification_id}/read")
 async def mark_as_read(notification_id: UUID, session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(Notification).where(Notification.id == notification_id))
     notification = result.scalar_one_or_none()
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
-    notification.is_read = True
-    await session.commit()
+    if not notification.is_read:
+        notification.is_read = True
+        await session.commit()
+        await adjust_unread_counts({notification.user_id: -1})
     return {"status": "success"}
@@ -19,6 +19,22 @@ class NotificationRead(BaseModel):
     timestamp: datetime
     is_read: bool
     type: str
+    count: int = 1
 
     class Config:
         from_attributes = True
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationRead]
+    head_cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+
+
+class UnreadCount(BaseModel):
+    user_id: uuid.UUID
+    unread: int
+
+
+class MarkReadResult(BaseModel):
+    updated: int
@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import any_, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import User
+from src.notifications.models import CHAT_MESSAGE_UNREAD, Notification
+
+# 9 bind parameters per row keeps each INSERT batch under asyncpg's 32767 limit
+INSERT_PAGE_SIZE = 3500
+
+
+async def create_notifications(
+    session: AsyncSession,
+    user_ids: Iterable[uuid.UUID],
+    message: str,
+    type: str,
+    event_id: Optional[str] = None,
+    event_title: Optional[str] = None,
+) -> List[Notification]:
+    """Insert one notification per recipient with a multi-row INSERT ... RETURNING.
+
+    chat_message notifications roll up: a recipient who already has an unread one
+    for the event gets that row bumped to "N new messages" instead of a new row.
+    Rows with count == 1 are new, i.e. raised the recipient's unread count.
+    """
+    now = datetime.now()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "event_id": event_id,
+            "event_title": event_title,
+            "message": message,
+            "type": type,
+            "timestamp": now,
+            "is_read": False,
+            "count": 1,
+        }
+        for user_id in dict.fromkeys(user_ids)
+    ]
+    if not rows:
+        return []
+    stmt = insert(Notification)
+    if type == "chat_message":
+        new_count = Notification.count + 1
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Notification.user_id, Notification.event_id],
+            index_where=text(CHAT_MESSAGE_UNREAD),
+            set_={
+                "count": new_count,
+                "message": func.concat(new_count, " new messages", func.coalesce(" in " + stmt.excluded.event_title, "")),
+                "timestamp": stmt.excluded.timestamp,
+            },
+        )
+    result = await session.scalars(
+        stmt.returning(Notification),
+        rows,
+        execution_options={"insertmanyvalues_page_size": INSERT_PAGE_SIZE, "populate_existing": True},
+    )
+    return result.all()
+
+
+async def get_fcm_tokens(session: AsyncSession, user_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, str]:
+    """Map recipients to their FCM tokens with a single `uid = ANY(:ids)` query."""
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+    stmt = select(User.uid, User.fcm_token).where(
+        User.uid == any_(bindparam("user_ids", ids, type_=ARRAY(UUID(as_uuid=True)))),
+        User.fcm_token.is_not(None),
+    )
+    result = await session.execute(stmt)
+    return {uid: token for uid, token in result.all()}
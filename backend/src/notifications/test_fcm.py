@@ -1,4 +1,5 @@
-from fcm import send_fcm_push
+# Run from the backend directory: python -m src.notifications.test_fcm
+from src.notifications.fcm import send_fcm_push
 
 # Replace this with a real device FCM token for testing
 TEST_FCM_TOKEN = "dOL_Q1i2QiKAHuQXApHJpt:APA91bGOqt2MSoFEkCewcXeHbRHSdrvnBVysc1ENSu9GXn0p37ksniJSjwDdaCTExLNf6DQQ4t7NfiSf5II9DVwSwsBpVdyQ4vl46449cy2ZHNcl2ulpd6Q"
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.redis import redis_client
+from src.notifications.models import Notification
+
+UNREAD_COUNT_EXPIRY = 3600
+
+# Adjust the counter only while it is cached; a missing key means "recount from the DB"
+_ADJUST_IF_CACHED = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+    if value < 0 then
+        redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+        return 0
+    end
+    return value
+end
+return nil
+""")
+
+
+def _unread_key(user_id) -> str:
+    return f"notifications:unread:{user_id}"
+
+
+async def adjust_unread_counts(deltas: Dict[UUID, int]) -> None:
+    if not deltas:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_id, delta in deltas.items():
+                await _ADJUST_IF_CACHED(keys=[_unread_key(user_id)], args=[delta], client=pipe)
+            await pipe.execute()
+    except Exception as e:
+        # The counter is a cache; drop it rather than fail the write
+        print(f"⚠️ Unread counter update failed: {e}")
+        await invalidate_unread_counts(deltas.keys())
+
+
+async def increment_unread_counts(user_ids: Iterable[UUID]) -> None:
+    deltas: Dict[UUID, int] = {}
+    for user_id in user_ids:
+        deltas[user_id] = deltas.get(user_id, 0) + 1
+    await adjust_unread_counts(deltas)
+
+
+async def invalidate_unread_counts(user_ids: Iterable[UUID]) -> None:
+    keys = [_unread_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except Exception as e:
+        print(f"⚠️ Unread counter invalidation failed: {e}")
+
+
+async def get_unread_count(user_id: UUID, session: AsyncSession) -> int:
+    key = _unread_key(user_id)
+    try:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as e:
+        print(f"⚠️ Unread counter read failed: {e}")
+
+    result = await session.execute(
+        select(func.count()).select_from(Notification).where(
+            Notification.user_id == user_id,
+            Notification.is_read == False,
+        )
+    )
+    count = result.scalar_one()
+    try:
+        # NX so a concurrent increment on a freshly cached value is not overwritten
+        await redis_client.set(key, count, ex=UNREAD_COUNT_EXPIRY, nx=True)
+    except Exception:
+        pass
+    return count
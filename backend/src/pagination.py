@@ -0,0 +1,24 @@
+import base64
+import json
+from typing import List
+
+from fastapi import HTTPException, status
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor, e.g. encode_cursor(row.timestamp.isoformat(), str(row.id))."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
@@ -0,0 +1,180 @@
+"""Token-bucket rate limiting backed by Redis.
+
+Policies are "<count>/<period>" strings such as "10/minute" or "20/10seconds":
+a bucket holds <count> tokens and refills at <count> per <period>, so short
+bursts are allowed while the long-run rate is capped. Each check is a single
+Lua script call. If Redis is unreachable, buckets fall back to process-local
+memory, which still protects each worker on its own.
+
+RateLimitMiddleware applies Settings.RATE_LIMITS ("METHOD /path/{param}" ->
+policy) to HTTP requests, keyed by the authenticated user when the request
+carries a valid bearer token and by client IP otherwise. Other code (e.g. the
+chat WebSocket) calls rate_limiter.hit() directly.
+
+The client IP is whatever uvicorn resolved from X-Forwarded-For, so per-IP keys
+are only as good as Settings.FORWARDED_ALLOW_IPS: it must list the deployment's
+load balancers and nothing else. Trusting every sender ("*") lets a client set
+its own IP per request and walk straight past the login and OTP limits.
+"""
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import jwt
+
+from src.config import Config
+from src.db.redis import redis_client
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_POLICY = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+# Refill, then take one token if there is one. Returns {allowed, tokens left, ms until next token}
+_TOKEN_BUCKET = redis_client.register_script("""
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+local wait = 0
+if tokens < 1 then
+    wait = math.ceil((1 - tokens) / rate)
+end
+return {allowed, math.floor(tokens), wait}
+""")
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    capacity: int
+    period: float  # seconds
+
+    @classmethod
+    def parse(cls, policy: str) -> "RatePolicy":
+        match = _POLICY.match(policy)
+        if not match or int(match.group(1)) == 0:
+            raise ValueError(f"Invalid rate limit policy {policy!r}, expected e.g. '10/minute'")
+        multiplier = int(match.group(2) or 1)
+        return cls(capacity=int(match.group(1)), period=multiplier * _PERIODS[match.group(3)])
+
+    @property
+    def rate_per_ms(self) -> float:
+        return self.capacity / (self.period * 1000)
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds
+
+
+class RateLimiter:
+    LOCAL_MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._local: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, policy: RatePolicy) -> RateLimitResult:
+        now = int(time.time() * 1000)
+        try:
+            allowed, remaining, wait = await _TOKEN_BUCKET(
+                keys=[f"ratelimit:{key}"], args=[policy.capacity, policy.rate_per_ms, now]
+            )
+        except Exception:
+            return self._hit_local(key, policy, now)
+        return RateLimitResult(bool(allowed), int(remaining), int(wait) / 1000)
+
+    def _hit_local(self, key: str, policy: RatePolicy, now: int) -> RateLimitResult:
+        tokens, ts = self._local.pop(key, (policy.capacity, now))
+        tokens = min(policy.capacity, tokens + max(0, now - ts) * policy.rate_per_ms)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._local[key] = (tokens, now)
+        if len(self._local) > self.LOCAL_MAX_BUCKETS:
+            self._local.popitem(last=False)
+        wait = 0 if tokens >= 1 else math.ceil((1 - tokens) / policy.rate_per_ms)
+        return RateLimitResult(allowed, int(tokens), wait / 1000)
+
+
+rate_limiter = RateLimiter()
+
+
+def _compile_route(route: str) -> Tuple[str, "re.Pattern"]:
+    method, _, path = route.strip().partition(" ")
+    pattern = re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(path.strip()))
+    return method.upper(), re.compile(f"^{pattern}$")
+
+
+def _client_identity(scope) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    claims = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
+                    return f"user:{claims['sub']}"
+                except (jwt.PyJWTError, KeyError):
+                    pass
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Answers 429 with Retry-After once a client exceeds a route's policy."""
+
+    def __init__(self, app, policies: Dict[str, str]):
+        self.app = app
+        self.routes: List[Tuple[str, "re.Pattern", str, RatePolicy]] = []
+        for route, policy in policies.items():
+            method, pattern = _compile_route(route)
+            self.routes.append((method, pattern, route, RatePolicy.parse(policy)))
+
+    def _match(self, method: str, path: str) -> Optional[Tuple[str, RatePolicy]]:
+        for route_method, pattern, route, policy in self.routes:
+            if route_method == method and pattern.match(path):
+                return route, policy
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        matched = self._match(scope["method"], scope["path"])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+
+        route, policy = matched
+        result = await rate_limiter.hit(f"{route}:{_client_identity(scope)}", policy)
+        if result.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = str(max(1, math.ceil(result.retry_after)))
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", retry_after.encode()),
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": json.dumps({"detail": "Too many requests, retry later"}).encode(),
+        })
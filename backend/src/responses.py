@@ -0,0 +1,27 @@
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class, renders with orjson (native UUID/datetime support) when available."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check with weak comparison: any listed tag, W/ or not, or "*"."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
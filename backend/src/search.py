@@ -0,0 +1,33 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func, literal_column
+
+SEARCH_CONFIG = "english"
+# Inlined as a typed literal: a bound parameter would reach Postgres as varchar,
+# which has no cast to regconfig
+SEARCH_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def to_prefix_tsquery(text: str) -> Optional[str]:
+    """Turn free text into a to_tsquery() string that ANDs every word.
+
+    The last word matches as a prefix so results update while the user types:
+    "beach clea" -> "beach & clea:*". Returns None when there is nothing to search.
+    Only word characters survive, so tsquery operators in the input are ignored.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    words[-1] += ":*"
+    return " & ".join(words)
+
+
+def prefix_tsquery(text: str):
+    """SQL tsquery for `text` (see to_prefix_tsquery), or None when it has no words."""
+    query = to_prefix_tsquery(text)
+    if query is None:
+        return None
+    return func.to_tsquery(SEARCH_REGCONFIG, query)
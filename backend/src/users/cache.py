@@ -0,0 +1,62 @@
+from typing import Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import User
+from src.db.redis import redis_client
+from src.users.schemas import UserSummary
+
+# Short enough that a missed invalidation heals quickly
+PROFILE_CACHE_EXPIRY = 300
+
+
+def _profile_key(user_id) -> str:
+    return f"users:profile:{user_id}"
+
+
+async def get_profiles(session: AsyncSession, user_ids: Iterable[UUID]) -> Dict[UUID, UserSummary]:
+    """Compact profiles for `user_ids` from Redis, loading misses with one ANY() query."""
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+
+    profiles: Dict[UUID, UserSummary] = {}
+    try:
+        cached = await redis_client.mget([_profile_key(user_id) for user_id in ids])
+    except Exception as e:
+        print(f"⚠️ Profile cache read failed: {e}")
+        cached = [None] * len(ids)
+    for user_id, raw in zip(ids, cached):
+        if raw is not None:
+            profiles[user_id] = UserSummary.model_validate_json(raw)
+
+    missing = [user_id for user_id in ids if user_id not in profiles]
+    if missing:
+        stmt = select(User).where(
+            User.uid == any_(bindparam("user_ids", missing, type_=ARRAY(PG_UUID(as_uuid=True))))
+        )
+        result = await session.execute(stmt)
+        loaded = [UserSummary.model_validate(user) for user in result.scalars().all()]
+        profiles.update((profile.uid, profile) for profile in loaded)
+        if loaded:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for profile in loaded:
+                        pipe.set(_profile_key(profile.uid), profile.model_dump_json(), ex=PROFILE_CACHE_EXPIRY)
+                    await pipe.execute()
+            except Exception as e:
+                print(f"⚠️ Profile cache write failed: {e}")
+    return profiles
+
+
+async def invalidate_profiles(user_ids: Iterable[UUID]) -> None:
+    keys = [_profile_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except Exception as e:
+        print(f"⚠️ Profile cache invalidation failed: {e}")
@@ -0,0 +1,110 @@
+"""Server-side volunteer certificates (PNG or PDF).
+
+Rendering is CPU-bound Pillow work, so it runs in a small process pool rather
+than on the event loop. The drawing code lives in certificates.render, outside
+src, so pool processes start without importing the app. Output is cached on
+disk under a hash of everything that appears on the certificate; an unchanged
+certificate is served from the cache (or answered with 304 through its ETag)
+without rendering again. Each user keeps only their latest render per format,
+so the cache holds at most two files per user.
+"""
+import asyncio
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Literal, Optional
+
+from certificates.render import RENDER_VERSION, render_certificate
+from src.config import Config
+
+CertificateFormat = Literal["png", "pdf"]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def certificate_payload(name: str, events_joined: int, hours_volunteered: float,
+                        average_rating: float, event_titles: List[str]) -> dict:
+    return {
+        "name": name,
+        "events_joined": events_joined,
+        "hours_volunteered": round(float(hours_volunteered), 1),
+        "average_rating": round(float(average_rating), 2),
+        "event_titles": sorted(event_titles),
+    }
+
+
+def certificate_key(payload: dict, fmt: CertificateFormat) -> str:
+    raw = json.dumps([RENDER_VERSION, fmt, payload], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _asset(*parts: str) -> str:
+    return os.path.join(Config.CERTIFICATE_ASSETS_DIR, *parts)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that runs an event loop and DB pool is not safe
+        _pool = ProcessPoolExecutor(
+            max_workers=Config.CERTIFICATE_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _cache_dir(owner) -> str:
+    return os.path.join(Config.CERTIFICATE_CACHE_DIR, str(owner))
+
+
+def _drop_stale_renders(directory: str, keep: str, fmt: CertificateFormat) -> None:
+    for path in glob.glob(os.path.join(directory, f"*.{fmt}")):
+        if path != keep:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+async def get_certificate_bytes(owner, payload: dict, fmt: CertificateFormat) -> bytes:
+    directory = _cache_dir(owner)
+    path = os.path.join(directory, f"{certificate_key(payload, fmt)}.{fmt}")
+    try:
+        with open(path, "rb") as cached:
+            return cached.read()
+    except FileNotFoundError:
+        pass
+
+    loop = asyncio.get_running_loop()
+    content = await loop.run_in_executor(
+        _get_pool(),
+        render_certificate,
+        payload,
+        fmt,
+        _asset("fonts", "GreatVibes-Regular.ttf"),
+        _asset("images", "signature.png"),
+    )
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, path)
+        # Older stats are never asked for again
+        _drop_stale_renders(directory, path, fmt)
+    except OSError as e:
+        print(f"⚠️ Certificate cache write failed: {e}")
+    return content
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
-from typing import Optional
+from sqlalchemy import Float, and_, case, cast, func, literal, or_
+from typing import List, Optional
 from pydantic import BaseModel
 
 from src.db.main import get_session
@@ -12,7 +12,12 @@ import uuid
 from src.events.models import EventResponse
 from src.events.models import Event
 from src.events.models import EventResponse
-from src.auth.models import User
+from src.auth.models import User, user_search_document
+from src.users.schemas import UserSearchPage, UserSummary, UserBatchRequest
+from src.users.cache import get_profiles
+from src.users.certificate import CertificateFormat, certificate_key, certificate_payload, get_certificate_bytes
+from src.pagination import encode_cursor, decode_cursor, MAX_PAGE_SIZE
+from src.responses import etag_matches
 from uuid import UUID
  
 
@@ -50,13 +55,7 @@ async def get_user_stats(
     }
 
 
-@user_router.get("/certificate_data")
-async def get_certificate_data(
-    session: AsyncSession = Depends(get_session),
-    token_data: dict = Depends(AccessTokenBearer())
-):
-    user_id = uuid.UUID(token_data["sub"])
-
+async def _certificate_stats(session: AsyncSession, user_id: uuid.UUID) -> dict:
     stmt_joined = select(func.count(EventResponse.event_id)).where(EventResponse.user_id == user_id)
     result_joined = await session.execute(stmt_joined)
     events_joined = result_joined.scalar_one() or 0
@@ -86,6 +85,104 @@ async def get_certificate_data(
     }
 
 
+@user_router.get("/certificate_data")
+async def get_certificate_data(
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(AccessTokenBearer())
+):
+    return await _certificate_stats(session, uuid.UUID(token_data["sub"]))
+
+
+@user_router.get("/certificate")
+async def get_certificate(
+    request: Request,
+    format: CertificateFormat = "pdf",
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(AccessTokenBearer())
+):
+    user_id = uuid.UUID(token_data["sub"])
+    user = await session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    stats = await _certificate_stats(session, user_id)
+    payload = certificate_payload(
+        name=f"{user.first_name} {user.last_name}".strip() or user.username,
+        events_joined=stats["events_joined"],
+        hours_volunteered=stats["hours_volunteered"],
+        average_rating=stats["average_rating"],
+        event_titles=stats["joined_event_titles"],
+    )
+    etag = f'"{certificate_key(payload, format)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    content = await get_certificate_bytes(user_id, payload, format)
+    headers["Content-Disposition"] = f'inline; filename="certificate.{format}"'
+    media_type = "application/pdf" if format == "pdf" else "image/png"
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with `prefix`."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+@user_router.get("/search", response_model=UserSearchPage)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    token_data: dict = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    text_query = q.strip().lower()
+    if not text_query:
+        return {"items": [], "next_cursor": None}
+
+    # Username prefix as an explicit range so the text_pattern_ops index is usable
+    # with bound parameters; LIKE 'abc%' only gets an index range from literals
+    username = func.lower(User.username)
+    prefix_match = and_(
+        username.op("~>=~")(text_query),
+        username.op("~<~")(_prefix_upper_bound(text_query)),
+    )
+    document = user_search_document()
+    fuzzy_match = literal(text_query).op("<%")(document)
+    # Username prefix hits rank above fuzzy ones
+    score = cast(func.word_similarity(text_query, document) + case((prefix_match, 1), else_=0), Float).label("score")
+
+    stmt = select(User, score).where(or_(prefix_match, fuzzy_match))
+    if cursor:
+        last_score, last_id = decode_cursor(cursor, 2)
+        try:
+            last_score, last_id = float(last_score), UUID(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(or_(score < last_score, and_(score == last_score, User.uid > last_id)))
+    result = await session.execute(stmt.order_by(score.desc(), User.uid).limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_user, last_score = rows[-1]
+        next_cursor = encode_cursor(last_score, str(last_user.uid))
+    return {"items": [user for user, _ in rows], "next_cursor": next_cursor}
+
+
+@user_router.post("/batch", response_model=List[UserSummary])
+async def get_users_batch(
+    payload: UserBatchRequest,
+    token_data: dict = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    profiles = await get_profiles(session, payload.user_ids)
+    # Input order, unknown ids skipped
+    return [profiles[user_id] for user_id in dict.fromkeys(payload.user_ids) if user_id in profiles]
+
+
 @user_router.get("/{user_id}")
 async def get_user_by_id(
     user_id: UUID,
@@ -144,7 +241,8 @@ async def update_fcm_token(user_id: UUID, data: FCMTokenUpdate, session: AsyncSe
     await session.commit()
     return {"status": "success"}
 
-@user_router.get("/all-ids")
+# Superseded by /search; kept for older clients
+@user_router.get("/all-ids", deprecated=True)
 async def get_all_user_ids(session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(User.uid))
     user_ids = [str(row[0]) for row in result.all()]
@@ -0,0 +1,27 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class UserSummary(BaseModel):
+    uid: UUID
+    username: str
+    first_name: str
+    last_name: str
+    city: str
+    country: str
+    profile_image_url: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class UserSearchPage(BaseModel):
+    items: List[UserSummary]
+    next_cursor: Optional[str] = None
+
+
+class UserBatchRequest(BaseModel):
+    user_ids: List[UUID] = Field(..., max_length=500)
@@ -0,0 +1,27 @@
+"""Settings for the test suite, applied before anything imports src.config.
+
+Tests run against SQLite and fakeredis, so only tables without Postgres-only
+columns can be created; Redis-backed caches are seeded directly instead.
+"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="volunsphere-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'test.db')}",
+    "REDIS_URL": "fakeredis://",
+    "JWT_SECRET_KEY": "test-secret",
+    "ENVIRONMENT": "test",
+    "STARTUP_MODE": "fast",
+    # One pooled connection and a short wait: anything that holds it fails fast
+    "DB_POOL_SIZE": "1",
+    "DB_MAX_OVERFLOW": "0",
+    "DB_POOL_TIMEOUT": "2",
+    "JOB_BACKEND": "inline",
+    "RATE_LIMIT_ENABLED": "false",
+    "METRICS_ENABLED": "false",
+    "NOTIFICATION_PRUNE_INTERVAL_SECONDS": "0",
+    "EVENT_REMINDER_POLL_SECONDS": "0",
+    "CHAT_PRESENCE_HEARTBEAT_SECONDS": "0",
+})
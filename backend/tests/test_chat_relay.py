@@ -0,0 +1,43 @@
+"""Chat messages reach sockets held by other workers."""
+import json
+import uuid
+
+import anyio
+from fastapi.testclient import TestClient
+
+from src import app
+from src.auth.utils import create_access_token
+from src.chat.models import ChatMessage
+from src.chat.relay import MESSAGE_CHANNEL
+from src.db.main import async_engine
+from src.db.redis import redis_client
+from src.events.membership import cache_new_event
+from src.users.cache import PROFILE_CACHE_EXPIRY, _profile_key
+from src.users.schemas import UserSummary
+
+
+async def _seed(user_id: uuid.UUID, event_id: uuid.UUID) -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(ChatMessage.__table__.create, checkfirst=True)
+    await cache_new_event(event_id, user_id)
+    profile = UserSummary(uid=user_id, username="volunteer", first_name="Vol", last_name="Unteer", city="Colombo", country="LK")
+    await redis_client.set(_profile_key(user_id), profile.model_dump_json(), ex=PROFILE_CACHE_EXPIRY)
+
+
+async def _publish_from_another_worker(event_id: uuid.UUID, message: dict) -> None:
+    # Wait for this worker's subscriber, the way a worker that is already up would have it
+    while not (await redis_client.pubsub_numsub(MESSAGE_CHANNEL))[0][1]:
+        await anyio.sleep(0.01)
+    await redis_client.publish(MESSAGE_CHANNEL, json.dumps({"room": str(event_id), "data": json.dumps(message)}))
+
+
+def test_messages_published_elsewhere_reach_local_sockets():
+    user_id, event_id = uuid.uuid4(), uuid.uuid4()
+    token = create_access_token({"uid": user_id, "email": "volunteer@example.com"})
+    message = {"username": "someone", "email": "someone@example.com", "message": "hello", "timestamp": "2026-01-01T00:00:00+00:00"}
+
+    with TestClient(app) as client:
+        client.portal.call(_seed, user_id, event_id)
+        with client.websocket_connect(f"/api/v1/chat/ws/{event_id}?token={token}") as ws:
+            client.portal.call(_publish_from_another_worker, event_id, message)
+            assert ws.receive_json() == message
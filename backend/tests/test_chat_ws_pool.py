@@ -0,0 +1,62 @@
+"""Open chat WebSockets must not hold pooled database connections."""
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from src import app
+from src.auth.utils import create_access_token
+from src.chat.models import ChatMessage
+from src.db.main import async_engine, async_session_maker
+from src.db.redis import redis_client
+from src.events.membership import cache_new_event
+from src.users.cache import PROFILE_CACHE_EXPIRY, _profile_key
+from src.users.schemas import UserSummary
+
+SOCKETS = 1000
+HISTORY = 3
+
+
+async def _seed(user_id: uuid.UUID, event_id: uuid.UUID) -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(ChatMessage.__table__.create, checkfirst=True)
+    async with async_session_maker() as session:
+        for n in range(HISTORY):
+            session.add(ChatMessage(
+                event_id=event_id,
+                user_id=user_id,
+                username="volunteer",
+                email="volunteer@example.com",
+                message=f"message {n}",
+                timestamp=datetime.now(timezone.utc),
+            ))
+        await session.commit()
+
+    # Connect-time lookups are served from Redis
+    await cache_new_event(event_id, user_id)
+    profile = UserSummary(uid=user_id, username="volunteer", first_name="Vol", last_name="Unteer", city="Colombo", country="LK")
+    await redis_client.set(_profile_key(user_id), profile.model_dump_json(), ex=PROFILE_CACHE_EXPIRY)
+
+
+def test_idle_chat_sockets_hold_no_pooled_connections():
+    user_id, event_id = uuid.uuid4(), uuid.uuid4()
+    token = create_access_token({"uid": user_id, "email": "volunteer@example.com"})
+    pool = async_engine.pool
+
+    with TestClient(app) as client:
+        client.portal.call(_seed, user_id, event_id)
+
+        with ExitStack() as sockets:
+            for _ in range(SOCKETS):
+                ws = sockets.enter_context(client.websocket_connect(f"/api/v1/chat/ws/{event_id}?token={token}"))
+                # With a one-connection pool, a socket that kept its session would
+                # make the next one time out while loading history
+                assert [ws.receive_json()["message"] for _ in range(HISTORY)] == [f"message {n}" for n in range(HISTORY)]
+                assert pool.checkedout() == 0
+
+            # HTTP requests still get the connection while every socket is open
+            response = client.get(f"/api/v1/chat/{event_id}/messages")
+            assert response.status_code == 200
+            assert len(response.json()) == HISTORY
+            assert pool.checkedout() == 0
@@ -0,0 +1,22 @@
+"""If-None-Match handling for cacheable responses."""
+import pytest
+
+from src.responses import etag_matches
+
+ETAG = '"5d41402abc4b2a76"'
+
+
+@pytest.mark.parametrize("header", [
+    ETAG,
+    f'W/{ETAG}',
+    f'"other", {ETAG}',
+    f' "other" , W/{ETAG} ',
+    "*",
+])
+def test_matching_tags(header):
+    assert etag_matches(header, ETAG)
+
+
+@pytest.mark.parametrize("header", [None, "", '"other"', '"5d41402abc4b2a76x"', f'"other", W/"{ETAG}"'])
+def test_other_tags(header):
+    assert not etag_matches(header, ETAG)
@@ -5,4 +5,4 @@ echo "Contents: $(ls -la)"
 cd backend
 echo "Changed to backend directory: $(pwd)"
 echo "Contents: $(ls -la)"
-python -m uvicorn src:app --host 0.0.0.0 --port $PORT
+python main.py
@@ -23,7 +23,7 @@ echo "⏳ Waiting for database to be ready..."
 sleep 5
 
 echo "🔄 Running database migrations..."
-python -m alembic upgrade head
+python -m src.db.migrate
 
 if [ $? -eq 0 ]; then
     echo "✅ Migrations completed successfully"
@@ -35,5 +35,5 @@ echo "🌟 Starting FastAPI server..."
 echo "Python path: $(which python)"
 echo "Current working directory: $(pwd)"
 
-# Start the server
-exec python -m uvicorn src:app --host 0.0.0.0 --port $PORT
+# Start the server (migrations already ran above)
+STARTUP_MODE=fast exec python main.py